@@ -3,26 +3,54 @@ import time
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from src.RandomPicker import RandomPicker
+from src.PickerCache import PickerCache
+from src.analysis.StreamingStats import StreamingStats
+from src.analysis.Downsampler import Downsampler
+from src.analysis.QualityBattery import QualityBattery
 import numpy as np
-import statistics
+
+# Points sent to the browser per series, whatever the history length
+POINT_BUDGET = 2000
+HISTORY_PAGE_SIZE = 100
+
+@st.cache_resource
+def picker_cache():
+    """Pools shared by every session of this server process"""
+    return PickerCache()
 
 def initialize_session_state():
     if 'history' not in st.session_state:
         st.session_state.history = []
     if 'picker' not in st.session_state:
         st.session_state.picker = None
+    if 'stats' not in st.session_state:
+        st.session_state.stats = StreamingStats()
+    if 'history_version' not in st.session_state:
+        # Bumped whenever history changes, keys the figure cache
+        st.session_state.history_version = 0
+    if 'figure_cache' not in st.session_state:
+        st.session_state.figure_cache = (None, {})
+
+def record_numbers(numbers):
+    st.session_state.history.extend(numbers)
+    st.session_state.stats.extend(numbers)
+    st.session_state.history_version += 1
+
+def clear_history():
+    st.session_state.history = []
+    st.session_state.stats.reset()
+    st.session_state.history_version += 1
 
 def create_distribution_plot(numbers, start, end):
-    df = pd.DataFrame({'Generated Numbers': numbers})
-    fig = px.histogram(
-        df,
-        x='Generated Numbers',
-        nbins=min(30, end-start+1),
-        title='Distribution of Generated Numbers',
-        labels={'Generated Numbers': 'Number', 'count': 'Frequency'}
-    )
+    # Bin server-side so only the bar heights reach the browser
+    counts, edges = np.histogram(numbers, bins=min(30, end-start+1), range=(start, end))
+    fig = go.Figure(data=[
+        go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges))
+    ])
     fig.update_layout(
+        title='Distribution of Generated Numbers',
+        xaxis_title='Number',
+        yaxis_title='Frequency',
         showlegend=False,
         xaxis_range=[start-1, end+1]
     )
@@ -53,10 +81,11 @@ def create_heatmap(numbers, start, end, num_bins=10):
 
     return fig
 
-def create_sequence_plot(numbers):
+def create_sequence_plot(numbers, downsampler):
+    indices, values = downsampler.lttb(numbers)
     df = pd.DataFrame({
-        'Index': range(1, len(numbers) + 1),
-        'Value': numbers
+        'Index': indices + 1,
+        'Value': values
     })
     fig = px.line(
         df,
@@ -66,11 +95,12 @@ def create_sequence_plot(numbers):
     )
     return fig
 
-def create_difference_plot(numbers):
-    differences = [0] + [numbers[i] - numbers[i-1] for i in range(1, len(numbers))]
+def create_difference_plot(numbers, downsampler):
+    differences = np.diff(numbers, prepend=numbers[:1])
+    indices, values = downsampler.min_max(differences)
     df = pd.DataFrame({
-        'Index': range(1, len(differences) + 1),
-        'Difference': differences
+        'Index': indices + 1,
+        'Difference': values
     })
     fig = px.bar(
         df,
@@ -80,35 +110,96 @@ def create_difference_plot(numbers):
     )
     return fig
 
-def safe_statistics(numbers):
-    """Calculate statistics safely with error handling"""
-    stats = {
-        'count': len(numbers),
-        'mean': 'N/A',
-        'median': 'N/A',
-        'std_dev': 'N/A',
-        'min': 'N/A',
-        'max': 'N/A',
-        'mode': 'N/A',
-        'unique': 0
-    }
-
-    if numbers:
-        stats['mean'] = f"{sum(numbers)/len(numbers):.2f}"
-        stats['min'] = min(numbers)
-        stats['max'] = max(numbers)
-        stats['unique'] = len(set(numbers))
-
-        if len(numbers) >= 2:
-            stats['std_dev'] = f"{statistics.stdev(numbers):.2f}"
-            stats['median'] = f"{statistics.median(numbers):.2f}"
-
-            try:
-                stats['mode'] = f"{statistics.mode(numbers)}"
-            except statistics.StatisticsError:
-                stats['mode'] = "Multiple modes"
-
-    return stats
+def cached_figures(start, end):
+    """Build the analysis figures once per history version"""
+    key = (st.session_state.history_version, start, end)
+    cached_key, figures = st.session_state.figure_cache
+    if cached_key != key:
+        numbers = np.array(st.session_state.history, dtype=np.int64)
+        downsampler = Downsampler(POINT_BUDGET)
+        figures = {
+            'distribution': create_distribution_plot(numbers, start, end),
+            'heatmap': create_heatmap(numbers, start, end),
+            'sequence': create_sequence_plot(numbers, downsampler),
+            'difference': create_difference_plot(numbers, downsampler)
+        }
+        st.session_state.figure_cache = (key, figures)
+    return figures
+
+def show_history_page(history, stats):
+    """One page of the history table, built from the page's slice only"""
+    pages = -(-len(history) // HISTORY_PAGE_SIZE)
+    page = st.number_input("History Page", min_value=1, max_value=pages, value=pages) if pages > 1 else 1
+    first = (page - 1) * HISTORY_PAGE_SIZE
+    last = min(first + HISTORY_PAGE_SIZE, len(history))
+
+    history_df = pd.DataFrame({
+        'Index': range(first + 1, last + 1),
+        'Generated Number': history[first:last],
+        'Running Mean': np.frombuffer(stats.running_means, dtype=np.float64)[first:last]
+    })
+
+    if len(history) >= 2:
+        history_df['Distance from Mean'] = (history_df['Generated Number'] - stats.mean).abs()
+
+    st.dataframe(history_df, hide_index=True)
+    st.caption(f"Showing {first + 1}-{last} of {len(history)}")
+
+def show_quality_tests(start, end):
+    """Run the quality battery over the history on request"""
+    with st.expander("Quality Tests"):
+        if st.button("Run Quality Tests"):
+            battery = QualityBattery(start, end)
+            history = st.session_state.history
+            for first in range(0, len(history), 65536):
+                battery.update(np.array(history[first:first + 65536], dtype=np.int64))
+            st.session_state.quality = (st.session_state.history_version, battery.results())
+
+        version, results = st.session_state.get('quality', (None, None))
+        if version != st.session_state.history_version:
+            st.write("Tests run over the current history. Small histories leave some tests out.")
+            return
+
+        st.dataframe(pd.DataFrame([
+            {
+                'Test': name.replace('_', ' ').title(),
+                'Statistic': result['statistic'],
+                'p-value': result['p_value'],
+                'Result': "Pass" if result['p_value'] >= 0.01 else "Fail"
+            }
+            for name, result in results.items()
+        ]), hide_index=True)
+
+def show_profile(profiler):
+    """Per-stage timing table of the picker's profiler"""
+    with st.expander("Performance Profile", expanded=True):
+        profile = profiler.to_dict()
+        if not profile:
+            st.write("Generate some numbers to collect timings.")
+            return
+
+        profile_df = pd.DataFrame([
+            {
+                'Stage': stage,
+                'Calls': stats['count'],
+                'Total (ms)': stats['total_seconds'] * 1000,
+                'Mean (µs)': stats['mean_seconds'] * 1e6,
+                'p50 ≤ (µs)': stats['p50_seconds'] * 1e6,
+                'p99 ≤ (µs)': stats['p99_seconds'] * 1e6,
+                'Max (µs)': stats['max_seconds'] * 1e6
+            }
+            for stage, stats in profile.items()
+        ]).sort_values('Total (ms)', ascending=False)
+        st.dataframe(profile_df, hide_index=True)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("Download Prometheus Metrics", profiler.to_prometheus(),
+                               file_name="numgen_profile.prom", mime="text/plain")
+        with col2:
+            if st.button("Reset Profile"):
+                profiler.reset()
+                st.rerun()
 
 def main():
     st.title("NumGen - Advanced Random Number Generator")
@@ -131,8 +222,16 @@ def main():
     if (st.session_state.picker is None or
         st.session_state.picker.start != start or
         st.session_state.picker.end != end):
-        st.session_state.picker = RandomPicker(start, end)
-        st.session_state.history = []
+        # Recently used ranges reuse their built pool, only per-session state is new
+        st.session_state.picker = picker_cache().get(start, end)
+        clear_history()
+
+    # Stage profiling costs nothing while switched off
+    profiling = st.sidebar.checkbox("Enable Profiling", value=False)
+    if profiling and st.session_state.picker.profiler is None:
+        st.session_state.picker.enable_profiling()
+    elif not profiling:
+        st.session_state.picker.disable_profiling()
 
     # Main content
     col1, col2 = st.columns(2)
@@ -141,26 +240,24 @@ def main():
         if st.button("Generate Single Number"):
             with st.spinner("Generating..."):
                 number = st.session_state.picker.pick()
-                st.session_state.history.append(number)
+                record_numbers([number])
                 st.success(f"Generated Number: {number}")
 
     with col2:
         num_multiple = st.number_input("Generate Multiple Numbers",
                                      min_value=1, max_value=1000, value=10)
         if st.button(f"Generate {num_multiple} Numbers"):
-            progress_bar = st.progress(0)
-            for i in range(num_multiple):
-                number = st.session_state.picker.pick()
-                st.session_state.history.append(number)
-                progress_bar.progress((i + 1) / num_multiple)
+            with st.spinner("Generating..."):
+                numbers = st.session_state.picker.pick_many(num_multiple).tolist()
+            record_numbers(numbers)
             st.success(f"Generated {num_multiple} numbers!")
 
     # Display analysis if we have numbers
     if st.session_state.history:
         st.header("Results Analysis")
 
-        # Calculate statistics safely
-        stats = safe_statistics(st.session_state.history)
+        # Statistics are kept up to date as numbers are generated
+        stats = st.session_state.stats.summary()
 
         # Statistics display
         col1, col2, col3, col4 = st.columns(4)
@@ -185,42 +282,36 @@ def main():
 
         # Visualizations
         if len(st.session_state.history) >= 2:
+            figures = cached_figures(start, end)
+
             st.subheader("Distribution Analysis")
             col1, col2 = st.columns(2)
             with col1:
-                st.plotly_chart(create_distribution_plot(st.session_state.history, start, end), use_container_width=True)
+                st.plotly_chart(figures['distribution'], use_container_width=True)
             with col2:
-                st.plotly_chart(create_heatmap(st.session_state.history, start, end), use_container_width=True)
+                st.plotly_chart(figures['heatmap'], use_container_width=True)
 
             st.subheader("Sequence Analysis")
             col1, col2 = st.columns(2)
             with col1:
-                st.plotly_chart(create_sequence_plot(st.session_state.history), use_container_width=True)
+                st.plotly_chart(figures['sequence'], use_container_width=True)
             with col2:
-                st.plotly_chart(create_difference_plot(st.session_state.history), use_container_width=True)
+                st.plotly_chart(figures['difference'], use_container_width=True)
 
         # History table
         st.subheader("Generation History")
-        history_df = pd.DataFrame({
-            'Index': range(1, len(st.session_state.history) + 1),
-            'Generated Number': st.session_state.history,
-            'Running Mean': [sum(st.session_state.history[:i+1])/(i+1)
-                           for i in range(len(st.session_state.history))]
-        })
+        show_history_page(st.session_state.history, st.session_state.stats)
 
-        if len(st.session_state.history) >= 2:
-            history_df['Distance from Mean'] = [
-                abs(x - float(stats['mean']))
-                for x in st.session_state.history
-            ]
-
-        st.dataframe(history_df)
+        show_quality_tests(start, end)
 
         # Clear history button
         if st.button("Clear History"):
-            st.session_state.history = []
+            clear_history()
             st.rerun()
 
+    if st.session_state.picker.profiler is not None:
+        show_profile(st.session_state.picker.profiler)
+
     # Technical details
     with st.expander("Technical Details"):
         st.write("""
@@ -0,0 +1,36 @@
+"""Compare SegmentedPool gap generation methods.
+
+Run from the repository root:
+    python -m benchmarks.gap_generation --sizes 100000 1000000 10000000 --fractions 0.1 0.5
+"""
+import argparse
+import random
+from src.structures.SegmentedPool import SegmentedPool
+from benchmarks.timing import time_call
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**5, 10**6, 10**7])
+    parser.add_argument('--fractions', type=float, nargs='+', default=[0.1])
+    parser.add_argument('--segments', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=4, help="threads for the parallel sample column")
+    args = parser.parse_args()
+
+    methods = [
+        ('rejection', dict(gap_method='rejection')),
+        ('sample', dict(gap_method='sample')),
+        (f'sample x{args.workers}', dict(gap_method='sample', workers=args.workers))
+    ]
+
+    print(f"{'size':>12} {'fraction':>9} " + " ".join(f"{name:>12}" for name, _ in methods))
+    for size in args.sizes:
+        for fraction in args.fractions:
+            timings = [
+                time_call(lambda: SegmentedPool(1, size, args.segments, rng=random.Random(0),
+                                                gap_fraction=fraction, **options))
+                for _, options in methods
+            ]
+            print(f"{size:>12} {fraction:>9} " + " ".join(f"{seconds:>11.3f}s" for seconds in timings))
+
+if __name__ == "__main__":
+    main()
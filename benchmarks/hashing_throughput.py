@@ -0,0 +1,62 @@
+"""Report HashingTransformer throughput per algorithm and for batch hashing.
+
+Run from the repository root:
+    python -m benchmarks.hashing_throughput --count 100000
+"""
+import argparse
+import hashlib
+import hmac
+import numpy as np
+from src.transformations.HashingTransformer import HashingTransformer, _PACK_U64
+from benchmarks.timing import time_call
+
+def rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:>12,.0f}/s"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100_000)
+    args = parser.parse_args()
+
+    transformer = HashingTransformer()
+    values = list(range(args.count))
+
+    print(f"{'algorithm':>12} {'fresh+str':>14} {'copy+packed':>14}")
+    for algorithm, salted in zip(transformer.algorithms, transformer._salted_states):
+        def fresh():
+            for value in values:
+                algorithm(str(value).encode() + transformer.salt).digest()
+
+        def reused():
+            for value in values:
+                h = salted.copy()
+                h.update(_PACK_U64(value))
+                h.digest()
+
+        print(f"{algorithm().name:>12} {rate(args.count, time_call(fresh))} {rate(args.count, time_call(reused))}")
+
+    key = transformer.keys[0]
+    inner, outer = transformer._keyed_states[0]
+
+    def fresh_hmac():
+        for value in values:
+            hmac.new(key, str(value).encode(), hashlib.sha512).digest()
+
+    def keyed_hmac():
+        for value in values:
+            h = inner.copy()
+            h.update(_PACK_U64(value))
+            digest = h.digest()
+            h = outer.copy()
+            h.update(digest)
+            h.digest()
+
+    print(f"{'hmac-sha512':>12} {rate(args.count, time_call(fresh_hmac))} {rate(args.count, time_call(keyed_hmac))}")
+
+    print(f"\n{'transform':>12} {rate(args.count, time_call(lambda: [transformer.transform(v) for v in values]))}")
+    numbers = np.arange(args.count, dtype=np.uint64)
+    seconds = time_call(lambda: transformer.transform_batch(numbers, np.random.default_rng(0)))
+    print(f"{'batch':>12} {rate(args.count, seconds)}")
+
+if __name__ == "__main__":
+    main()
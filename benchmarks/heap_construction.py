@@ -0,0 +1,43 @@
+"""Compare MinHeap/MaxHeap construction strategies.
+
+Run from the repository root:
+    python -m benchmarks.heap_construction --sizes 100000 1000000 10000000
+"""
+import argparse
+from src.structures.MinHeap import MinHeap
+from src.structures.MaxHeap import MaxHeap
+from benchmarks.timing import time_call
+
+def build_by_insert(numbers):
+    min_heap, max_heap = MinHeap(), MaxHeap()
+    for num in numbers:
+        min_heap.insert(num)
+        max_heap.insert(num)
+
+def build_by_heapify(numbers):
+    MinHeap(numbers)
+    MaxHeap(numbers)
+
+def build_presorted(numbers):
+    MinHeap(numbers, presorted=True)
+    MaxHeap(reversed(numbers), presorted=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**5, 10**6, 10**7])
+    args = parser.parse_args()
+
+    methods = [
+        ('insert', build_by_insert),
+        ('heapify', build_by_heapify),
+        ('presorted', build_presorted)
+    ]
+
+    print(f"{'size':>12} " + " ".join(f"{name:>12}" for name, _ in methods))
+    for size in args.sizes:
+        numbers = list(range(size))
+        timings = [time_call(lambda: method(numbers)) for _, method in methods]
+        print(f"{size:>12} " + " ".join(f"{seconds:>11.3f}s" for seconds in timings))
+
+if __name__ == "__main__":
+    main()
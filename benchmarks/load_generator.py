@@ -0,0 +1,68 @@
+"""Load-test a running NumGen server and report requests/s and latency percentiles.
+
+Start the server first (python main.py serve), then run from the repository root:
+    python -m benchmarks.load_generator --clients 32 --requests 200 --n 1
+"""
+import argparse
+import asyncio
+import time
+import numpy as np
+
+async def client(host: str, port: int, request: bytes, count: int, latencies: list):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(count):
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            response = await reader.readline()
+            latencies.append(time.perf_counter() - started)
+            if response.startswith(b'ERR'):
+                raise RuntimeError(response.decode().strip())
+    finally:
+        writer.close()
+
+async def run(args) -> dict:
+    if args.n == 1:
+        request = f"PICK {args.start} {args.end}\n".encode()
+    else:
+        request = f"PICK_MANY {args.start} {args.end} {args.n}\n".encode()
+
+    # Warm the server's picker for this range before measuring
+    await client(args.host, args.port, request, 1, [])
+
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(args.host, args.port, request, args.requests, latencies) for _ in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - started
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed,
+        'numbers_per_second': len(latencies) * args.n / elapsed,
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p90_ms': float(np.percentile(latencies_ms, 90)),
+        'p99_ms': float(np.percentile(latencies_ms, 99)),
+        'max_ms': float(latencies_ms.max())
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765, help="TCP line-protocol port")
+    parser.add_argument('--start', type=int, default=1)
+    parser.add_argument('--end', type=int, default=1000)
+    parser.add_argument('--n', type=int, default=1, help="numbers per request")
+    parser.add_argument('--clients', type=int, default=32, help="concurrent connections")
+    parser.add_argument('--requests', type=int, default=200, help="requests per connection")
+    args = parser.parse_args()
+
+    for name, value in asyncio.run(run(args)).items():
+        print(f"{name:>20}: {value:,.3f}" if isinstance(value, float) else f"{name:>20}: {value:,}")
+
+if __name__ == "__main__":
+    main()
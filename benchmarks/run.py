@@ -0,0 +1,188 @@
+"""Benchmark suite for RandomPicker, the structures and the transformers.
+
+Run from the repository root:
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --baseline results.json       # run and compare
+    python -m benchmarks.run --compare baseline.json current.json
+
+Every metric is a cost (seconds or bytes), so lower is better, and is
+the best of --repeat passes over the suite. Compare mode flags metrics
+that grew by more than their threshold (relative; --threshold for
+timings, tighter for memory) and exits with status 1 if any did.
+Latencies are compared on the median only, the mean and tail
+percentiles of single picks are noise.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+import numpy as np
+from src.RandomPicker import RandomPicker
+from src.structures.SegmentedPool import SegmentedPool
+from src.transformations.BitwiseTransformer import BitwiseTransformer
+from src.transformations.MathTransformer import MathTransformer
+from src.transformations.HashingTransformer import HashingTransformer
+from benchmarks.heap_construction import build_by_heapify, build_presorted
+from benchmarks.timing import time_call
+
+# Passes over the whole suite, the best value of every metric is kept
+REPEAT = 5
+# Shortest run, quick calls are repeated within a run until it lasts this long
+MIN_SECONDS = 0.05
+# Recorded for inspection only, too noisy to gate on
+TAIL_METRICS = ('mean_seconds', 'p90_seconds', 'p99_seconds', 'max_seconds')
+# Relative growth flagged per metric, timings fall back to --threshold
+METRIC_THRESHOLDS = {'peak_bytes': 0.05}
+
+def measure(func: Callable) -> Dict[str, float]:
+    """Wall time and peak traced memory of func"""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': time_call(func, min_seconds=MIN_SECONDS), 'peak_bytes': peak}
+
+def latency_distribution(samples: List[float]) -> Dict[str, float]:
+    samples = np.array(samples)
+    return {
+        'mean_seconds': float(samples.mean()),
+        'p50_seconds': float(np.percentile(samples, 50)),
+        'p90_seconds': float(np.percentile(samples, 90)),
+        'p99_seconds': float(np.percentile(samples, 99)),
+        'max_seconds': float(samples.max())
+    }
+
+def bench_init(sizes: List[int]) -> Dict[str, Dict[str, float]]:
+    return {f"init/{size}": measure(lambda: RandomPicker(1, size, rng=random.Random(0))) for size in sizes}
+
+def bench_pick(sizes: List[int], picks: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for size in sizes:
+        picker = RandomPicker(1, size, rng=random.Random(0))
+        samples = []
+        for _ in range(picks):
+            started = time.perf_counter()
+            picker.pick()
+            samples.append(time.perf_counter() - started)
+        results[f"pick/{size}"] = latency_distribution(samples)
+
+        seconds = time_call(lambda: picker.pick_many(picks), min_seconds=MIN_SECONDS)
+        results[f"pick_many/{size}"] = {'per_number_seconds': seconds / picks}
+    return results
+
+def bench_transformers(calls: int) -> Dict[str, Dict[str, float]]:
+    rng = random.Random(0)
+    numbers = [rng.getrandbits(63) for _ in range(calls)]
+    array = np.array(numbers, dtype=np.uint64)
+    results = {}
+    for name, transformer in [('bitwise', BitwiseTransformer(rng=rng)),
+                              ('math', MathTransformer(rng=rng)),
+                              ('hash', HashingTransformer(rng=rng))]:
+        def scalar_calls():
+            for number in numbers:
+                transformer.transform(number)
+        scalar = time_call(scalar_calls, min_seconds=MIN_SECONDS) / calls
+        batch = time_call(lambda: transformer.transform_batch(array, np.random.default_rng(0)),
+                          min_seconds=MIN_SECONDS) / calls
+
+        results[f"transform/{name}"] = {'per_call_seconds': scalar, 'batch_per_number_seconds': batch}
+    return results
+
+def bench_gaps(sizes: List[int]) -> Dict[str, Dict[str, float]]:
+    return {f"gaps/{size}": measure(lambda: SegmentedPool(1, size, 5, rng=random.Random(0))) for size in sizes}
+
+def bench_heaps(sizes: List[int]) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for size in sizes:
+        numbers = list(range(size))
+        results[f"heaps/{size}"] = {
+            'heapify_seconds': time_call(lambda: build_by_heapify(numbers), min_seconds=MIN_SECONDS),
+            'presorted_seconds': time_call(lambda: build_presorted(numbers), min_seconds=MIN_SECONDS)
+        }
+    return results
+
+def run_suite(args) -> Dict:
+    sizes = [10 ** exponent for exponent in range(2, args.max_exponent + 1)]
+    results = {}
+    # Whole passes rather than back-to-back repeats, so a slow spell of the
+    # machine spoils one pass of a metric instead of every run of it
+    for _ in range(args.repeat):
+        run = {}
+        run.update(bench_init(sizes))
+        run.update(bench_pick([size for size in sizes if size <= 10 ** 6], args.picks))
+        run.update(bench_transformers(args.calls))
+        run.update(bench_gaps(sizes))
+        run.update(bench_heaps([size for size in sizes if size >= 10 ** 5]))
+        for name, metrics in run.items():
+            best = results.setdefault(name, {})
+            for metric, value in metrics.items():
+                best[metric] = min(value, best.get(metric, value))
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'repeat': args.repeat,
+            'timestamp': time.time()
+        },
+        'results': results
+    }
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """Descriptions of every gated metric that regressed by more than its threshold"""
+    regressions = []
+    for name, metrics in current['results'].items():
+        for metric, value in metrics.items():
+            if metric in TAIL_METRICS:
+                continue
+            previous = baseline['results'].get(name, {}).get(metric)
+            if previous and value > previous * (1 + METRIC_THRESHOLDS.get(metric, threshold)):
+                regressions.append(f"{name} {metric}: {previous:.6g} -> {value:.6g} (+{value / previous - 1:.0%})")
+    return regressions
+
+def report(regressions: List[str]) -> int:
+    if not regressions:
+        print("No regressions", file=sys.stderr)
+        return 0
+    print(f"{len(regressions)} regression(s):", file=sys.stderr)
+    for line in regressions:
+        print(f"  {line}", file=sys.stderr)
+    return 1
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', help="write JSON results here instead of stdout")
+    parser.add_argument('--baseline', help="compare the run against this stored result")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help="only compare two stored results")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="relative growth of a timing flagged as a regression")
+    parser.add_argument('--repeat', type=int, default=REPEAT, help="passes over the suite, the best is kept")
+    parser.add_argument('--max-exponent', type=int, default=7, help="largest range size as a power of 10")
+    parser.add_argument('--picks', type=int, default=2000, help="picks per latency measurement")
+    parser.add_argument('--calls', type=int, default=2000, help="calls per transformer measurement")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as baseline, open(args.compare[1]) as current:
+            return report(compare(json.load(baseline), json.load(current), args.threshold))
+
+    results = run_suite(args)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            return report(compare(json.load(baseline), results, args.threshold))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
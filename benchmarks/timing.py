@@ -0,0 +1,22 @@
+"""Timing helper shared by the benchmark scripts."""
+import time
+from typing import Callable
+
+def time_call(func: Callable, repeat: int = 1, min_seconds: float = 0.0) -> float:
+    """Best wall time of one func call over `repeat` runs.
+
+    With min_seconds, each run calls func as many times as it takes to last
+    that long (as timeit's autorange does), so short calls are not at the
+    mercy of timer resolution and brief scheduling stalls. The minimum over
+    runs is the least noisy estimate.
+    """
+    number = 1
+    while min_seconds and _run(func, number) < min_seconds:
+        number *= 2
+    return min(_run(func, number) for _ in range(repeat)) / number
+
+def _run(func: Callable, number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - started
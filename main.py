@@ -1,5 +1,13 @@
 from src.RandomPicker import RandomPicker
+from src.ParallelGenerator import ParallelGenerator
+from src import NumGenServer
+from src.analysis.QualityBattery import QualityBattery
+import argparse
+import os
+import random
+import sys
 import time
+import numpy as np
 
 def detailed_test():
     print("Advanced Random Number Generator Test")
@@ -20,8 +28,110 @@ def detailed_test():
         # Add a small delay for readability
         time.sleep(1)
 
-if __name__ == "__main__":
+def generate_chunks(args):
+    """Yield arrays of generated numbers, at most chunk_size at a time"""
+    if args.workers > 1:
+        with ParallelGenerator(args.start, args.end, args.workers, args.seed, args.segments) as generator:
+            for produced in range(0, args.count, args.chunk_size):
+                yield generator.generate(min(args.chunk_size, args.count - produced))
+    else:
+        rng = random.Random(args.seed)
+        picker = RandomPicker(args.start, args.end, args.segments, rng=rng)
+        yield from picker.stream(args.chunk_size, args.count)
+
+def generate_to_file(args):
+    # Unsigned words when every number is non-negative
+    dtype = np.dtype('<u8') if args.start >= 0 else np.dtype('<i8')
+
+    started = time.perf_counter()
     try:
-        detailed_test()
-    except Exception as e:
-        print(f"An error occurred: {str(e)}")
+        with open(args.output, 'w' if args.format == 'txt' else 'wb') as output:
+            if args.format == 'npy':
+                # The length is known up front, so the header can be written before the data
+                header = {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (args.count,)}
+                np.lib.format.write_array_header_1_0(output, header)
+
+            for chunk in generate_chunks(args):
+                if args.format == 'txt':
+                    np.savetxt(output, chunk, fmt='%d')
+                else:
+                    output.write(chunk.astype(dtype).tobytes())
+    except BaseException:
+        # Don't leave a truncated file that looks like valid output
+        if os.path.exists(args.output):
+            os.remove(args.output)
+        raise
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Wrote {args.count:,} numbers to {args.output} in {elapsed:.2f}s "
+        f"({args.count / elapsed:,.0f} numbers/s, {args.count * 8 / elapsed / 2**20:.1f} MiB/s)",
+        file=sys.stderr
+    )
+
+def run_quality_tests(args):
+    battery = QualityBattery(args.start, args.end)
+    started = time.perf_counter()
+    battery.run(generate_chunks(args))
+    print(battery.report())
+    print(f"Tested in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="NumGen random number generator")
+    subcommands = parser.add_subparsers(dest='command')
+
+    subcommands.add_parser('demo', help="Print a few numbers step by step (default)")
+
+    generate = subcommands.add_parser('generate', help="Write numbers to a file in bounded memory")
+    generate.add_argument('--start', type=int, required=True)
+    generate.add_argument('--end', type=int, required=True)
+    generate.add_argument('--count', type=int, required=True)
+    generate.add_argument('--output', required=True)
+    generate.add_argument('--format', choices=['raw', 'npy', 'txt'], default='raw',
+                          help="raw little-endian 64-bit words, .npy or one number per line")
+    generate.add_argument('--chunk-size', type=int, default=65536)
+    generate.add_argument('--segments', type=int, default=5)
+    generate.add_argument('--seed', type=int, default=None)
+    generate.add_argument('--workers', type=int, default=1,
+                          help="worker processes; output is reproducible for a given seed and worker count")
+
+    test = subcommands.add_parser('test', help="Run statistical quality tests over generated numbers")
+    test.add_argument('--start', type=int, required=True)
+    test.add_argument('--end', type=int, required=True)
+    test.add_argument('--count', type=int, default=1_000_000)
+    test.add_argument('--chunk-size', type=int, default=65536)
+    test.add_argument('--segments', type=int, default=5)
+    test.add_argument('--seed', type=int, default=None)
+    test.add_argument('--workers', type=int, default=1)
+
+    serve = subcommands.add_parser('serve', help="Serve pick requests over TCP and HTTP")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--tcp-port', type=int, default=8765)
+    serve.add_argument('--http-port', type=int, default=8766)
+    serve.add_argument('--batch-window', type=float, default=0.002,
+                       help="seconds to wait for concurrent requests to join a batch")
+    serve.add_argument('--workers', type=int, default=4, help="executor threads for generation")
+
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command in ('generate', 'test'):
+        # Scripted commands: report failures on stderr with a failing exit status
+        try:
+            if args.command == 'generate':
+                generate_to_file(args)
+            else:
+                run_quality_tests(args)
+        except Exception as e:
+            print(f"An error occurred: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        try:
+            if args.command == 'serve':
+                NumGenServer.run(args.host, args.tcp_port, args.http_port,
+                                 batch_window=args.batch_window, workers=args.workers)
+            else:
+                detailed_test()
+        except Exception as e:
+            print(f"An error occurred: {str(e)}")
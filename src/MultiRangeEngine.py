@@ -0,0 +1,137 @@
+import random
+import numpy as np
+from typing import Dict, Optional, Sequence, Tuple
+from src.PickerCache import PickerCache
+from src.structures.HistoryBuffer import HistoryBuffer
+from src.structures.SegmentedPool import SegmentedPool
+from src.transformations.BitwiseTransformer import BitwiseTransformer
+from src.transformations.MathTransformer import MathTransformer
+from src.transformations.HashingTransformer import HashingTransformer
+
+class MultiRangeEngine:
+    """Serve draws for any number of [start, end] ranges from one transform pipeline.
+
+    A single set of transformers produces a buffered stream of 64-bit
+    words, and each request reduces words to its own range without bias
+    (words below 2^64 mod span are rejected, the rest taken modulo span).
+    Ranges hold no state unless registered: a registered range draws from
+    its SegmentedPool (shared through a PickerCache) so its gaps are
+    respected, and optionally keeps a HistoryBuffer of its draws. Not
+    thread-safe, like RandomPicker.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None, chunk_size: int = 65536,
+                 pool_cache: Optional[PickerCache] = None):
+        self.rng = rng if rng is not None else random.Random()
+        self.chunk_size = chunk_size
+        self.pool_cache = pool_cache if pool_cache is not None else PickerCache()
+
+        # One pipeline for every range
+        self.bitwise_transformer = BitwiseTransformer(rng=self.rng)
+        self.math_transformer = MathTransformer(rng=self.rng)
+        self.hash_transformer = HashingTransformer(rng=self.rng)
+        self.np_rng = np.random.default_rng(self.rng.getrandbits(128))
+
+        self._words = np.empty(0, dtype=np.uint64)
+        self._cursor = 0
+        # (start, end) -> (pool or None, history or None), registered ranges only
+        self._ranges: Dict[Tuple[int, int], Tuple[Optional[SegmentedPool], Optional[HistoryBuffer]]] = {}
+
+    def register(self, start: int, end: int, segment_count: int = 5, gaps: bool = True,
+                 history_size: int = 0, seed: Optional[int] = None):
+        """Keep per-range state: gaps from a segmented pool and/or a draw history"""
+        if start > end:
+            raise ValueError("start must not exceed end")
+        pool = self.pool_cache.pool(start, end, segment_count, seed) if gaps else None
+        history = HistoryBuffer(start, end, history_size, rng=self.rng) if history_size > 0 else None
+        self._ranges[(start, end)] = (pool, history)
+
+    def unregister(self, start: int, end: int):
+        self._ranges.pop((start, end), None)
+
+    def history(self, start: int, end: int) -> Optional[HistoryBuffer]:
+        state = self._ranges.get((start, end))
+        return state[1] if state is not None else None
+
+    def raw(self, n: int) -> np.ndarray:
+        """Next n words of the shared 64-bit stream"""
+        parts = []
+        while n > 0:
+            if self._cursor == len(self._words):
+                self._refill()
+            taken = self._words[self._cursor:self._cursor + n]
+            self._cursor += len(taken)
+            n -= len(taken)
+            parts.append(taken)
+        if len(parts) == 1:
+            return parts[0].copy()
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.uint64)
+
+    def _refill(self):
+        inputs = self.np_rng.integers(0, 2**64, self.chunk_size, dtype=np.uint64)
+        # The keyed hash makes every word uniform; the math transform alone is
+        # many-to-one, so the other stages are folded in rather than chained
+        self._words = (self.hash_transformer.transform_batch(inputs, self.np_rng) ^
+                       self.bitwise_transformer.transform_batch(inputs, self.np_rng) ^
+                       self.math_transformer.transform_batch(inputs, self.np_rng))
+        self._cursor = 0
+
+    def pick(self, start: int, end: int) -> int:
+        return int(self.draw([(start, end)])[0])
+
+    def pick_many(self, start: int, end: int, n: int) -> np.ndarray:
+        return self.draw(np.broadcast_to(np.array([start, end], dtype=np.int64), (n, 2)))
+
+    def draw(self, pairs: Sequence[Tuple[int, int]]) -> np.ndarray:
+        """One draw per (start, end) pair, as an int64 array"""
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        starts, ends = pairs[:, 0], pairs[:, 1]
+        if (starts > ends).any():
+            raise ValueError("start must not exceed end")
+        results = np.empty(len(pairs), dtype=np.int64)
+
+        stateless = np.ones(len(pairs), dtype=bool)
+        if self._ranges:
+            for key in {tuple(pair) for pair in np.unique(pairs, axis=0).tolist()} & self._ranges.keys():
+                selected = np.flatnonzero((starts == key[0]) & (ends == key[1]))
+                stateless[selected] = False
+                results[selected] = self._draw_registered(key, len(selected))
+
+        selected = np.flatnonzero(stateless)
+        # end - start + 1 in wrapping uint64, 0 stands for the full 2^64 span
+        spans = ends[selected].astype(np.uint64) - starts[selected].astype(np.uint64) + np.uint64(1)
+        offsets = self._reduce(spans)
+        results[selected] = (starts[selected].astype(np.uint64) + offsets).view(np.int64)
+        return results
+
+    def _draw_registered(self, key: Tuple[int, int], n: int) -> np.ndarray:
+        pool, history = self._ranges[key]
+        if pool is not None:
+            numbers = pool.kth_array(self._reduce(np.full(n, pool.count(), dtype=np.uint64)).astype(np.int64))
+        else:
+            span = (key[1] - key[0] + 1) % 2**64
+            numbers = (np.uint64(key[0] % 2**64) + self._reduce(np.full(n, span, dtype=np.uint64))).view(np.int64)
+        if history is not None:
+            history.extend(numbers[-history.capacity:].tolist())
+        return numbers
+
+    def _reduce(self, spans: np.ndarray) -> np.ndarray:
+        """Unbiased offsets in [0, span) for each span, redrawing rejected words"""
+        full = spans == 0
+        safe_spans = np.where(full, np.uint64(1), spans)
+        # 2^64 mod span: words below it would make low offsets more likely
+        thresholds = np.where(full, np.uint64(0), (np.uint64(0) - safe_spans) % safe_spans)
+
+        words = self.raw(len(spans))
+        rejected = np.flatnonzero(words < thresholds)
+        while len(rejected):
+            words[rejected] = self.raw(len(rejected))
+            rejected = rejected[words[rejected] < thresholds[rejected]]
+        return np.where(full, words, words % safe_spans)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'registered_ranges': len(self._ranges),
+            'buffered_words': len(self._words) - self._cursor,
+            **{f"pool_cache_{name}": value for name, value in self.pool_cache.stats().items()}
+        }
@@ -0,0 +1,222 @@
+import asyncio
+import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+import numpy as np
+from src.RandomPicker import RandomPicker
+
+# Pickers work on int64 numbers
+INT64_MIN, INT64_MAX = -2**63, 2**63 - 1
+
+class RangeBatcher:
+    """Coalesces concurrent requests for one range into single pick_many calls"""
+
+    def __init__(self, picker: RandomPicker, executor: ThreadPoolExecutor,
+                 batch_window: float, max_batch: int):
+        self.picker = picker
+        self.executor = executor
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._pending = []  # (count, future) waiting for the next batch
+        self._pending_total = 0
+        self._worker = None
+
+    async def request(self, count: int) -> np.ndarray:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((count, future))
+        self._pending_total += count
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.ensure_future(self._run())
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            # Give concurrent requests a moment to join, unless the batch is already full
+            if self._pending_total < self.max_batch:
+                await asyncio.sleep(self.batch_window)
+            # Take whole requests up to max_batch numbers (always at least one),
+            # later ones wait for the next call
+            taken, total = 0, 0
+            while taken < len(self._pending) and (taken == 0 or total + self._pending[taken][0] <= self.max_batch):
+                total += self._pending[taken][0]
+                taken += 1
+            batch, self._pending = self._pending[:taken], self._pending[taken:]
+            self._pending_total -= total
+
+            # The picker is not thread-safe, so one batch per range runs at a time
+            try:
+                numbers = await loop.run_in_executor(self.executor, self.picker.pick_many, total)
+            except Exception as error:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            offset = 0
+            for count, future in batch:
+                if not future.done():
+                    future.set_result(numbers[offset:offset + count])
+                offset += count
+
+class NumGenServer:
+    """asyncio server for pick / pick_many over a TCP line protocol and HTTP.
+
+    Line protocol, one request per line:
+        PICK <start> <end>              -> <number>
+        PICK_MANY <start> <end> <n>     -> <number> <number> ...
+        errors are answered with ERR <message>
+
+    HTTP:
+        GET /pick?start=1&end=100
+        GET /pick_many?start=1&end=100&n=10
+    answered with JSON. Concurrent requests for the same range are batched
+    into one pick_many call that runs on an executor, and pickers are kept
+    warm per range (least recently used ones are dropped beyond max_ranges).
+    """
+
+    def __init__(self, host: str = '127.0.0.1', tcp_port: int = 8765, http_port: int = 8766,
+                 batch_window: float = 0.002, max_batch: int = 65536, max_request: int = 1_000_000,
+                 max_ranges: int = 64, workers: int = 4):
+        self.host = host
+        self.tcp_port = tcp_port
+        self.http_port = http_port
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_request = max_request
+        self.max_ranges = max_ranges
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self._batchers: "OrderedDict[Tuple[int, int], RangeBatcher]" = OrderedDict()
+        # Batchers still being built, awaited by every request for the range meanwhile
+        self._building: Dict[Tuple[int, int], asyncio.Future] = {}
+        self._servers: List[asyncio.AbstractServer] = []
+
+    async def start(self):
+        self._servers = [
+            await asyncio.start_server(self._handle_tcp, self.host, self.tcp_port),
+            await asyncio.start_server(self._handle_http, self.host, self.http_port)
+        ]
+        # Report the bound ports, useful when started on port 0
+        self.tcp_port = self._servers[0].sockets[0].getsockname()[1]
+        self.http_port = self._servers[1].sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self.start()
+        await asyncio.gather(*(server.serve_forever() for server in self._servers))
+
+    async def stop(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self.executor.shutdown(wait=False)
+
+    async def pick_many(self, start: int, end: int, count: int) -> np.ndarray:
+        if start >= end:
+            raise ValueError("start must be less than end")
+        if start < INT64_MIN or end > INT64_MAX:
+            raise ValueError(f"start and end must be between {INT64_MIN} and {INT64_MAX}")
+        if end - start + 1 > INT64_MAX:
+            raise ValueError(f"the range cannot span more than {INT64_MAX} numbers")
+        if not 1 <= count <= self.max_request:
+            raise ValueError(f"n must be between 1 and {self.max_request}")
+        return await (await self._batcher(start, end)).request(count)
+
+    async def _batcher(self, start: int, end: int) -> RangeBatcher:
+        key = (start, end)
+        batcher = self._batchers.get(key)
+        if batcher is None:
+            # Concurrent first requests for a range share one build
+            building = self._building.get(key)
+            if building is None:
+                building = self._building[key] = asyncio.ensure_future(self._build_batcher(start, end))
+                building.add_done_callback(lambda _: self._building.pop(key, None))
+            batcher = await building
+        if key in self._batchers:
+            self._batchers.move_to_end(key)
+        return batcher
+
+    async def _build_batcher(self, start: int, end: int) -> RangeBatcher:
+        # Building a picker for a large range is CPU-heavy too
+        loop = asyncio.get_running_loop()
+        picker = await loop.run_in_executor(self.executor, RandomPicker, start, end)
+        batcher = RangeBatcher(picker, self.executor, self.batch_window, self.max_batch)
+        self._batchers[(start, end)] = batcher
+        while len(self._batchers) > self.max_ranges:
+            self._batchers.popitem(last=False)
+        return batcher
+
+    async def _handle_tcp(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write((await self._answer_line(line)).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _answer_line(self, line: bytes) -> str:
+        try:
+            parts = line.decode().split()
+            command = parts[0].upper() if parts else ''
+            if command == 'PICK' and len(parts) == 3:
+                numbers = await self.pick_many(int(parts[1]), int(parts[2]), 1)
+                return str(numbers[0])
+            if command == 'PICK_MANY' and len(parts) == 4:
+                numbers = await self.pick_many(int(parts[1]), int(parts[2]), int(parts[3]))
+                return ' '.join(map(str, numbers.tolist()))
+            return "ERR expected PICK <start> <end> or PICK_MANY <start> <end> <n>"
+        except ValueError as error:
+            return f"ERR {error}"
+        except Exception as error:
+            # Any failure is answered, the connection stays usable
+            return f"ERR {type(error).__name__}: {error}"
+
+    async def _handle_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            # Skip headers, requests carry no body
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            status, body = await self._answer_http(request_line)
+            payload = json.dumps(body).encode()
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _answer_http(self, request_line: bytes) -> Tuple[str, Dict]:
+        try:
+            parts = request_line.decode().split()
+            if len(parts) < 2 or parts[0] != 'GET':
+                return "405 Method Not Allowed", {'error': "only GET is supported"}
+            url = urlsplit(parts[1])
+            query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            start, end = int(query['start']), int(query['end'])
+            if url.path == '/pick':
+                numbers = await self.pick_many(start, end, 1)
+                return "200 OK", {'number': int(numbers[0])}
+            if url.path == '/pick_many':
+                numbers = await self.pick_many(start, end, int(query.get('n', 1)))
+                return "200 OK", {'numbers': numbers.tolist()}
+            return "404 Not Found", {'error': "unknown path"}
+        except KeyError as error:
+            return "400 Bad Request", {'error': f"missing parameter {error}"}
+        except ValueError as error:
+            return "400 Bad Request", {'error': str(error)}
+        except Exception as error:
+            return "500 Internal Server Error", {'error': f"{type(error).__name__}: {error}"}
+
+def run(host: str = '127.0.0.1', tcp_port: int = 8765, http_port: int = 8766, **options):
+    server = NumGenServer(host, tcp_port, http_port, **options)
+    asyncio.run(server.serve_forever())
@@ -0,0 +1,74 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+import numpy as np
+from src.RandomPicker import RandomPicker
+from src.rng.CounterRNG import CounterRNG
+
+# The picker of the shard this worker process serves, set by _init_shard
+_shard_picker: Optional[RandomPicker] = None
+
+def _seed_int(seed: np.random.SeedSequence) -> int:
+    return int.from_bytes(seed.generate_state(4, np.uint64).tobytes(), 'little')
+
+def _init_shard(start: int, end: int, segment_count: int,
+                pool_seed: np.random.SeedSequence, seed: np.random.SeedSequence):
+    """Build this worker's picker once, over the gap layout every shard shares"""
+    global _shard_picker
+    pool = RandomPicker.create_pool(start, end, segment_count, rng=random.Random(_seed_int(pool_seed)))
+    _shard_picker = RandomPicker(start, end, segment_count, rng=CounterRNG(_seed_int(seed)), pool=pool)
+
+def _generate_shard(count: int) -> np.ndarray:
+    """Continue this worker's stream by count numbers (runs in a worker)"""
+    return _shard_picker.pick_many(count)
+
+class ParallelGenerator:
+    """Generate numbers in worker processes, reproducibly from one master seed.
+
+    Every shard runs in its own single-process executor holding one picker
+    for the generator's lifetime, so successive generate() calls continue
+    the same independent streams instead of rebuilding pickers. All shards
+    draw from one gap layout. Shards are merged in worker order, so the
+    same seed and worker count always give the same output.
+    """
+
+    def __init__(self, start: int, end: int, workers: Optional[int] = None,
+                 seed: Optional[int] = None, segment_count: int = 5):
+        self.start = start
+        self.end = end
+        self.workers = workers or os.cpu_count() or 1
+        self.segment_count = segment_count
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self._executors: List[ProcessPoolExecutor] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for executor in self._executors:
+            executor.shutdown()
+        self._executors = []
+
+    def _start_workers(self):
+        # One child seed for the shared gap layout, one per shard stream
+        pool_seed, *seeds = self.seed_sequence.spawn(self.workers + 1)
+        self._executors = [
+            ProcessPoolExecutor(
+                max_workers=1, initializer=_init_shard,
+                initargs=(self.start, self.end, self.segment_count, pool_seed, seed)
+            )
+            for seed in seeds
+        ]
+
+    def generate(self, n: int) -> np.ndarray:
+        # Shard sizes differ by at most one, earlier shards take the remainder
+        sizes = [n // self.workers + (i < n % self.workers) for i in range(self.workers)]
+
+        if not self._executors:
+            self._start_workers()
+        shards = [executor.submit(_generate_shard, size) for executor, size in zip(self._executors, sizes)]
+        return np.concatenate([shard.result() for shard in shards])
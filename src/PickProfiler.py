@@ -0,0 +1,125 @@
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Tuple
+
+class PickProfiler:
+    """Per-stage timers, call counters and latency histograms for RandomPicker.
+
+    Attaching installs timing wrappers as instance attributes over the
+    picker's stage methods and detaching deletes them again, so a picker
+    without a profiler runs exactly the uninstrumented code.
+    """
+
+    # Histogram bucket upper bounds in seconds, the last bucket is unbounded
+    BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+               1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, float('inf'))
+
+    def __init__(self):
+        self.stages = {}
+        self._installed: List[Tuple[object, str]] = []
+
+    def attach(self, picker):
+        """Instrument every stage of pick() and pick_many()"""
+        strategy = picker.selection_strategy
+        for target, method, stage in [
+            (picker, 'pick', 'pick'),
+            (strategy, 'select_candidates', 'select_candidates'),
+            (strategy, 'select_pool_candidates', 'select_candidates'),
+            (picker.bitwise_transformer, 'transform', 'transform.bitwise'),
+            (picker.math_transformer, 'transform', 'transform.math'),
+            (picker.hash_transformer, 'transform', 'transform.hash'),
+            (picker, '_select_final_number', 'select_final'),
+            (picker, '_generate_number_in_sparse_region', 'select_final.sparse_region'),
+            (picker.deque, 'shuffle_step', 'shuffle'),
+            (picker.deque, 'rotate', 'shuffle'),
+            (strategy, 'rotate_pool', 'shuffle'),
+            (picker.history, 'append', 'history'),
+            (picker, 'pick_many', 'pick_many'),
+            (strategy, 'select_candidates_batch', 'batch.select_candidates'),
+            (picker.bitwise_transformer, 'transform_batch', 'batch.transform.bitwise'),
+            (picker.math_transformer, 'transform_batch', 'batch.transform.math'),
+            (picker.hash_transformer, 'transform_batch', 'batch.transform.hash'),
+            (picker, '_select_final_numbers', 'batch.select_final')
+        ]:
+            self._instrument(target, method, stage)
+
+    def detach(self):
+        for target, method in reversed(self._installed):
+            # Drop the instance attribute, exposing the class method again
+            delattr(target, method)
+        self._installed = []
+
+    def _instrument(self, target: object, method: str, stage: str):
+        original = getattr(target, method)
+        record = self.record
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            started = clock()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                record(stage, clock() - started)
+
+        setattr(target, method, timed)
+        self._installed.append((target, method))
+
+    def record(self, stage: str, seconds: float):
+        stats = self.stages.get(stage)
+        if stats is None:
+            stats = self.stages[stage] = {'count': 0, 'total': 0.0, 'max': 0.0,
+                                          'buckets': [0] * len(self.BUCKETS)}
+        stats['count'] += 1
+        stats['total'] += seconds
+        stats['max'] = max(stats['max'], seconds)
+        stats['buckets'][bisect_left(self.BUCKETS, seconds)] += 1
+
+    def time(self, stage: str, func: Callable, *args, **kwargs):
+        """Run func and record its duration under stage"""
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def reset(self):
+        self.stages = {}
+
+    def to_dict(self) -> Dict[str, Dict]:
+        result = {}
+        for stage, stats in self.stages.items():
+            result[stage] = {
+                'count': stats['count'],
+                'total_seconds': stats['total'],
+                'mean_seconds': stats['total'] / stats['count'],
+                'max_seconds': stats['max'],
+                'p50_seconds': self._quantile(stats['buckets'], stats['count'], 0.50),
+                'p99_seconds': self._quantile(stats['buckets'], stats['count'], 0.99),
+                'histogram': dict(zip(map(str, self.BUCKETS), stats['buckets']))
+            }
+        return result
+
+    def to_prometheus(self, name: str = 'numgen_stage_seconds') -> str:
+        lines = [
+            f"# HELP {name} Time spent in each RandomPicker stage",
+            f"# TYPE {name} histogram"
+        ]
+        for stage, stats in sorted(self.stages.items()):
+            cumulative = 0
+            for bound, count in zip(self.BUCKETS, stats['buckets']):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {stats["total"]}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {stats["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def _quantile(self, buckets: List[int], count: int, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile"""
+        target = q * count
+        cumulative = 0
+        for bound, bucket_count in zip(self.BUCKETS, buckets):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return bound
+        return self.BUCKETS[-1]
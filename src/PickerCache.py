@@ -0,0 +1,105 @@
+import random
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from src.RandomPicker import RandomPicker
+from src.structures.SegmentedPool import SegmentedPool
+from src.structures.MinHeap import MinHeap
+from src.structures.MaxHeap import MaxHeap
+
+class PickerCache:
+    """Process-wide LRU of built pools, handing out fresh pickers around them.
+
+    The segmented pool (segment layout and gaps) and the heaps over it are
+    the expensive part of a picker and are never modified after
+    construction, so one pool and one pair of heaps per (start, end,
+    segment_count, seed) are shared by every picker for that
+    configuration. pool() caches the pool alone; the heaps are only built
+    by the first get() that needs them. Each get() returns a new picker
+    with its own deque, history and generators. Entries are evicted least
+    recently used first once their estimated size exceeds max_bytes. Safe
+    to use from several threads.
+    """
+
+    # Rough CPython cost of one excluded number: two list slots, two int objects, one int64
+    BYTES_PER_GAP = 88
+    # Rough cost of one available number in the heaps: two list slots, one shared int object
+    BYTES_PER_NUMBER = 44
+
+    def __init__(self, max_bytes: int = 256 * 2**20):
+        self.max_bytes = max_bytes
+        # key -> (pool, heaps or None until a non-implicit get(), estimated bytes)
+        self._pools: "OrderedDict[Tuple, Tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, start: int, end: int, segment_count: int = 5, seed: Optional[int] = None) -> RandomPicker:
+        """A new picker over the shared pool; seeded pickers repeat the same stream"""
+        pool, heaps = self._entry(start, end, segment_count, seed, with_heaps=True)
+        return RandomPicker(start, end, segment_count, rng=random.Random(seed), pool=pool, heaps=heaps)
+
+    def pool(self, start: int, end: int, segment_count: int = 5, seed: Optional[int] = None) -> SegmentedPool:
+        """The shared pool alone; its heaps are left for the first get() to build"""
+        return self._entry(start, end, segment_count, seed, with_heaps=False)[0]
+
+    def _entry(self, start: int, end: int, segment_count: int, seed: Optional[int],
+               with_heaps: bool) -> Tuple[SegmentedPool, Optional[Tuple[MinHeap, MaxHeap]]]:
+        key = (start, end, segment_count, seed)
+        # Implicit pickers never read heaps
+        needs_heaps = with_heaps and end - start + 1 <= RandomPicker.IMPLICIT_THRESHOLD
+        with self._lock:
+            entry = self._pools.get(key)
+            if entry is not None:
+                self._pools.move_to_end(key)
+                self.hits += 1
+                if entry[1] is not None or not needs_heaps:
+                    return entry[0], entry[1]
+                pool = entry[0]
+            else:
+                self.misses += 1
+                pool = None
+
+        # Build outside the lock so other configurations stay available meanwhile
+        if pool is None:
+            pool = RandomPicker.create_pool(start, end, segment_count, rng=random.Random(seed))
+        heaps = RandomPicker.create_heaps(pool) if needs_heaps else None
+        size = self.estimate_bytes(pool, heaps is not None)
+
+        with self._lock:
+            entry = self._pools.get(key)
+            if entry is not None and (entry[1] is not None or heaps is None):
+                # Another thread built it first, keep a single shared copy
+                return entry[0], entry[1]
+            if entry is not None:
+                # Replace the pool-only entry with one that carries heaps
+                del self._pools[key]
+                self._bytes -= entry[2]
+            if size <= self.max_bytes:
+                self._pools[key] = (pool, heaps, size)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    _, (_, _, evicted_size) = self._pools.popitem(last=False)
+                    self._bytes -= evicted_size
+        return pool, heaps
+
+    def estimate_bytes(self, pool: SegmentedPool, heaps: bool = False) -> int:
+        size = len(pool.excluded_numbers) * self.BYTES_PER_GAP + 64 * len(pool.segments) + 1024
+        if heaps:
+            size += pool.count() * self.BYTES_PER_NUMBER
+        return size
+
+    def clear(self):
+        with self._lock:
+            self._pools.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._pools),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
@@ -0,0 +1,205 @@
+import json
+import random
+from typing import Dict, Tuple
+import numpy as np
+from src.structures.SegmentedPool import SegmentedPool
+from src.structures.MinHeap import MinHeap
+from src.structures.MaxHeap import MaxHeap
+from src.structures.CustomDeque import CustomDeque
+from src.structures.HistoryBuffer import HistoryBuffer
+from src.transformations.BitwiseTransformer import BitwiseTransformer
+from src.transformations.MathTransformer import MathTransformer
+from src.transformations.HashingTransformer import HashingTransformer
+from src.strategies.SelectionStrategy import SelectionStrategy
+from src.rng.CounterRNG import CounterRNG
+
+class PickerSnapshot:
+    """Single-file binary snapshot of a RandomPicker.
+
+    Layout: MAGIC, the JSON header length as a little-endian uint64, the
+    JSON header (scalars, generator states and an array directory), then
+    each array at an ALIGNMENT-byte boundary. Arrays are read through one
+    read-only memory map. Heaps are not stored: they are the sorted pool
+    and are rebuilt from the gap layout with NumPy.
+    """
+
+    MAGIC = b'NUMGEN\x00\x01'
+    ALIGNMENT = 64
+
+    @classmethod
+    def save(cls, picker, path: str):
+        arrays = {
+            'excluded': np.array(picker.segmented_pool.excluded_numbers, dtype=np.int64),
+            'history_buffer': np.array(picker.history._buffer, dtype=np.int64),
+            'history_sparse': np.array(picker.history._sparse, dtype=np.int64),
+            'salt': np.frombuffer(picker.hash_transformer.salt, dtype=np.uint8),
+            'keys': np.frombuffer(b''.join(picker.hash_transformer.keys), dtype=np.uint8)
+        }
+        header = {
+            'start': picker.start,
+            'end': picker.end,
+            'segment_count': picker.segmented_pool.segment_count,
+            'max_gaps': picker.segmented_pool.max_gaps,
+            'gap_fraction': picker.segmented_pool.gap_fraction,
+            'implicit': picker.implicit,
+            'history': {
+                'capacity': picker.history.capacity,
+                'region_count': picker.history.region_count,
+                'head': picker.history._head,
+                'size': picker.history._size
+            },
+            'strategy': {
+                'pick_count': picker.selection_strategy.pick_count,
+                'pool_offset': picker.selection_strategy.pool_offset
+            },
+            'np_rng': picker.np_rng.bit_generator.state
+        }
+
+        if not picker.implicit:
+            deque = picker.deque
+            arrays['deque'] = np.array(list(deque), dtype=np.int64)
+            header['deque'] = {
+                'capacity': len(deque._buffer),
+                'head': deque._head,
+                'shuffle_cursor': deque._shuffle_cursor
+            }
+
+        if picker.weight_table is not None:
+            arrays['weights'] = picker.weight_table.weights[:len(picker.weight_table)]
+            header['weights'] = {'kind': picker.weight_kind, 'block_size': picker.weight_table.block_size}
+
+        header['rng'], rng_words = cls._rng_state(picker.rng)
+        if rng_words is not None:
+            arrays['rng'] = rng_words
+
+        # Lay the arrays out behind the header, each on an aligned offset
+        header['arrays'] = {}
+        offset = 0
+        for name, array in arrays.items():
+            offset = cls._align(offset)
+            header['arrays'][name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+            offset += array.nbytes
+
+        encoded = json.dumps(header).encode()
+        prefix = cls.MAGIC + np.uint64(len(encoded)).astype('<u8').tobytes() + encoded
+        data_start = cls._align(len(prefix))
+        with open(path, 'wb') as output:
+            output.write(prefix.ljust(data_start, b'\0'))
+            for name, array in arrays.items():
+                output.seek(data_start + header['arrays'][name]['offset'])
+                output.write(np.ascontiguousarray(array).tobytes())
+
+    @classmethod
+    def load(cls, path: str, picker_class):
+        """Rebuild a picker that continues exactly where the saved one stopped"""
+        header, arrays = cls._read(path)
+        start, end = header['start'], header['end']
+
+        picker = picker_class.__new__(picker_class)
+        picker.start = start
+        picker.end = end
+        picker.range = end - start + 1
+        picker.implicit = header['implicit']
+        picker.rng = rng = cls._restore_rng(header['rng'], arrays.get('rng'))
+
+        history = header['history']
+        picker.history = HistoryBuffer(start, end, history['capacity'], history['region_count'], rng=rng)
+        picker.history._buffer = arrays['history_buffer'].tolist()
+        picker.history._head = history['head']
+        picker.history._size = history['size']
+        for num in picker.history:
+            picker.history.region_counts[picker.history.region_of(num)] += 1
+        picker.history._sparse = arrays['history_sparse'].tolist()
+        for slot, region in enumerate(picker.history._sparse):
+            picker.history._sparse_slot[region] = slot
+
+        picker.segmented_pool = SegmentedPool(
+            start, end, header['segment_count'], max_gaps=header['max_gaps'],
+            rng=rng, excluded=arrays['excluded'], gap_fraction=header['gap_fraction']
+        )
+
+        picker.min_heap = MinHeap()
+        picker.max_heap = MaxHeap()
+        picker.deque = CustomDeque(rng=rng)
+        if not picker.implicit:
+            # The heaps only ever hold the ascending pool
+            numbers = np.delete(np.arange(start, end + 1, dtype=np.int64),
+                                np.asarray(arrays['excluded']) - start).tolist()
+            picker.min_heap.heapify(numbers, presorted=True)
+            picker.max_heap.heapify(reversed(numbers), presorted=True)
+
+            deque = header['deque']
+            items = arrays['deque'].tolist()
+            # Logical order back to buffer slots: item i sits at (head + i) % capacity
+            padded = items + [None] * (deque['capacity'] - len(items))
+            split = len(padded) - deque['head']
+            picker.deque._buffer = padded[split:] + padded[:split]
+            picker.deque._head = deque['head']
+            picker.deque._size = len(items)
+            picker.deque._shuffle_cursor = deque['shuffle_cursor']
+
+        picker.bitwise_transformer = BitwiseTransformer(rng=rng)
+        picker.math_transformer = MathTransformer(rng=rng)
+        keys = bytes(arrays['keys'])
+        picker.hash_transformer = HashingTransformer(
+            rng=rng, salt=bytes(arrays['salt']),
+            keys=[keys[i:i + 32] for i in range(0, len(keys), 32)]
+        )
+
+        picker.selection_strategy = SelectionStrategy(rng=rng)
+        picker.selection_strategy.pick_count = header['strategy']['pick_count']
+        picker.selection_strategy.pool_offset = header['strategy']['pool_offset']
+
+        bit_generator = getattr(np.random, header['np_rng']['bit_generator'])()
+        bit_generator.state = header['np_rng']
+        picker.np_rng = np.random.Generator(bit_generator)
+
+        picker.profiler = None
+        picker.weight_kind = None
+        picker.weight_table = None
+        if 'weights' in header:
+            weights = header['weights']
+            picker.set_weights(**{weights['kind']: np.array(arrays['weights'])}, block_size=weights['block_size'])
+        return picker
+
+    @classmethod
+    def _read(cls, path: str) -> Tuple[Dict, Dict[str, np.ndarray]]:
+        data = np.memmap(path, dtype=np.uint8, mode='r')
+        if bytes(data[:len(cls.MAGIC)]) != cls.MAGIC:
+            raise ValueError(f"{path} is not a RandomPicker snapshot")
+        length_end = len(cls.MAGIC) + 8
+        length = int(data[len(cls.MAGIC):length_end].view('<u8')[0])
+        header = json.loads(bytes(data[length_end:length_end + length]))
+
+        data_start = cls._align(length_end + length)
+        arrays = {}
+        for name, entry in header['arrays'].items():
+            dtype = np.dtype(entry['dtype'])
+            first = data_start + entry['offset']
+            count = int(np.prod(entry['shape'], dtype=np.int64))
+            arrays[name] = data[first:first + count * dtype.itemsize].view(dtype).reshape(entry['shape'])
+        return header, arrays
+
+    @staticmethod
+    def _rng_state(rng: random.Random):
+        """JSON-able state and optional word array of a supported generator"""
+        if isinstance(rng, CounterRNG):
+            return {'kind': 'counter', 'state': list(rng.getstate())}, None
+        if type(rng) is random.Random:
+            version, words, gauss_next = rng.getstate()
+            return {'kind': 'mt19937', 'version': version, 'gauss_next': gauss_next}, np.array(words, dtype=np.uint32)
+        raise ValueError(f"cannot snapshot a {type(rng).__name__} generator")
+
+    @staticmethod
+    def _restore_rng(state: Dict, words) -> random.Random:
+        if state['kind'] == 'counter':
+            rng = CounterRNG(0)
+            rng.setstate(tuple(state['state']))
+            return rng
+        rng = random.Random()
+        rng.setstate((state['version'], tuple(words.tolist()), state['gauss_next']))
+        return rng
+
+    @classmethod
+    def _align(cls, offset: int) -> int:
+        return -(-offset // cls.ALIGNMENT) * cls.ALIGNMENT
@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+from src.RandomPicker import RandomPicker
+
+class PrefetchingPicker:
+    """Serve pick() from a buffer of precomputed numbers kept filled in the background.
+
+    A worker thread refills the buffer with pick_many() whenever it drops
+    below the low watermark and stops once it reaches the high watermark,
+    so pick() is a constant-time dequeue as long as the buffer keeps up.
+    The wrapped picker must only be used through this wrapper.
+    """
+
+    def __init__(self, picker: RandomPicker, high_watermark: int = 4096,
+                 low_watermark: Optional[int] = None, refill_chunk: int = 1024):
+        if low_watermark is None:
+            low_watermark = high_watermark // 4
+        if not 0 <= low_watermark < high_watermark:
+            raise ValueError("low_watermark must be in [0, high_watermark)")
+
+        self.picker = picker
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.refill_chunk = refill_chunk
+
+        self._buffer = deque()
+        self._condition = threading.Condition()
+        self._filling = True
+        self._closed = False
+        self._error = None
+
+        # Counters for sizing the buffer
+        self.hits = 0  # pick() served straight from the buffer
+        self.misses = 0  # pick() found the buffer empty
+        self.stall_seconds = 0.0  # Time pick() spent waiting for a refill
+        self.refills = 0  # Chunks generated by the worker
+        self.refill_seconds = 0.0
+
+        self._worker = threading.Thread(target=self._refill_loop, name="numgen-prefetch", daemon=True)
+        self._worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def pick(self) -> int:
+        with self._condition:
+            if self._buffer:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._filling = True
+                self._condition.notify_all()
+                stalled = time.perf_counter()
+                while not self._buffer and self._error is None and not self._closed:
+                    self._condition.wait()
+                self.stall_seconds += time.perf_counter() - stalled
+                if self._error is not None:
+                    raise self._error
+                if not self._buffer:
+                    raise RuntimeError("PrefetchingPicker is closed")
+
+            number = self._buffer.popleft()
+            if len(self._buffer) < self.low_watermark and not self._filling:
+                self._filling = True
+                self._condition.notify_all()
+            return number
+
+    def stats(self) -> Dict[str, float]:
+        with self._condition:
+            picks = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / picks if picks else 0.0,
+                'stall_seconds': self.stall_seconds,
+                'refills': self.refills,
+                'refill_seconds': self.refill_seconds,
+                'buffered': len(self._buffer)
+            }
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._worker.join()
+
+    def _refill_loop(self):
+        while True:
+            with self._condition:
+                while not self._closed and not self._filling:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                size = min(self.refill_chunk, self.high_watermark - len(self._buffer))
+                if size <= 0:
+                    self._filling = False
+                    continue
+
+            # Generate outside the lock so pick() keeps draining the buffer meanwhile
+            started = time.perf_counter()
+            try:
+                numbers = self.picker.pick_many(size).tolist()
+            except Exception as error:
+                with self._condition:
+                    self._error = error
+                    self._condition.notify_all()
+                return
+
+            with self._condition:
+                self._buffer.extend(numbers)
+                self.refills += 1
+                self.refill_seconds += time.perf_counter() - started
+                if len(self._buffer) >= self.high_watermark:
+                    self._filling = False
+                self._condition.notify_all()
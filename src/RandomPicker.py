@@ -1,53 +1,142 @@
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Sequence, Tuple
+import itertools
 import random
-import statistics
-from src.structures.SegmentedPool import SegmentedPool
+import numpy as np
+from src.structures.SegmentedPool import SegmentedPool, INT64_MAX
 from src.structures.MinHeap import MinHeap
 from src.structures.MaxHeap import MaxHeap
 from src.structures.CustomDeque import CustomDeque
+from src.structures.HistoryBuffer import HistoryBuffer
+from src.structures.PoolPermutation import PoolPermutation
+from src.structures.AliasTable import AliasTable
 from src.transformations.BitwiseTransformer import BitwiseTransformer
 from src.transformations.MathTransformer import MathTransformer
 from src.transformations.HashingTransformer import HashingTransformer
 from src.strategies.SelectionStrategy import SelectionStrategy
+from src.PickProfiler import PickProfiler
 
 class RandomPicker:
-    def __init__(self, start: int, end: int, segment_count: int = 5):
+    # Ranges larger than this are served from the implicit pool instead of
+    # materializing every number into the heaps and deque
+    IMPLICIT_THRESHOLD = 1_000_000
+    # Per-segment cap on gaps in implicit mode, keeps memory proportional to gaps
+    IMPLICIT_MAX_GAPS = 100_000
+    # Fisher-Yates swaps performed per pick by the incremental deque shuffle
+    SHUFFLE_STEPS = 8
+    # sample() shuffles positions once k exceeds 1/SAMPLE_DENSE_RATIO of the pool
+    SAMPLE_DENSE_RATIO = 8
+
+    def __init__(self, start: int, end: int, segment_count: int = 5, implicit: Optional[bool] = None,
+                 history_size: int = 1000, region_count: int = 10, rng: Optional[random.Random] = None,
+                 gap_fraction: float = 0.1, pool: Optional[SegmentedPool] = None,
+                 heaps: Optional[Tuple[MinHeap, MaxHeap]] = None):
         self.start = start
         self.end = end
         self.range = end - start + 1
-        self.history = []  # Keep track of generated numbers
+        if self.range > INT64_MAX:
+            # Offsets and pool positions are int64 throughout
+            raise ValueError("a picker cannot span more than 2^63 - 1 numbers")
+        # Per-instance generator shared by every component (random.Random or compatible)
+        self.rng = rng if rng is not None else random.Random()
+        # Keep track of the last history_size generated numbers per region
+        self.history = HistoryBuffer(start, end, history_size, region_count, rng=self.rng)
+        self.implicit = self.range > self.IMPLICIT_THRESHOLD if implicit is None else implicit
 
-        # Initialize data structures with more segments
-        self.segmented_pool = SegmentedPool(start, end, segment_count)
-        self.min_heap = MinHeap()
-        self.max_heap = MaxHeap()
-        self.deque = CustomDeque()
+        # Initialize data structures with more segments, unless a built pool is shared in.
+        # The pool is never modified after construction, so pickers can share one
+        if pool is None:
+            pool = self.create_pool(start, end, segment_count, self.implicit, self.rng, gap_fraction)
+        elif (pool.start, pool.end) != (start, end):
+            raise ValueError("pool does not cover [start, end]")
+        self.segmented_pool = pool
+        # Heaps are only read once built, so pickers of one pool can share them too
+        self.min_heap, self.max_heap = heaps if heaps is not None else (MinHeap(), MaxHeap())
+        self.deque = CustomDeque(rng=self.rng)
 
         # Initialize transformers
-        self.bitwise_transformer = BitwiseTransformer()
-        self.math_transformer = MathTransformer()
-        self.hash_transformer = HashingTransformer()
+        self.bitwise_transformer = BitwiseTransformer(rng=self.rng)
+        self.math_transformer = MathTransformer(rng=self.rng)
+        self.hash_transformer = HashingTransformer(rng=self.rng)
 
         # Initialize selection strategy
-        self.selection_strategy = SelectionStrategy()
+        self.selection_strategy = SelectionStrategy(rng=self.rng)
+
+        # Generator for batch picks, seeded from the picker's generator
+        self.np_rng = np.random.default_rng(self.rng.getrandbits(128))
+
+        # Stage profiling, off unless enable_profiling() is called
+        self.profiler = None
+
+        # Weighted picks, off unless set_weights() is called
+        self.weight_kind = None
+        self.weight_table = None
 
         # Initialize structures with segmented numbers
-        self._initialize_structures()
+        self._initialize_structures(build_heaps=heaps is None)
 
-    def _initialize_structures(self):
-        numbers = self.segmented_pool.get_all_numbers()
-        for num in numbers:
-            self.min_heap.insert(num)
-            self.max_heap.insert(num)
-            self.deque.append(num)
+    @classmethod
+    def create_pool(cls, start: int, end: int, segment_count: int = 5, implicit: Optional[bool] = None,
+                    rng: Optional[random.Random] = None, gap_fraction: float = 0.1) -> SegmentedPool:
+        """The segmented pool a picker with these settings would build"""
+        if implicit is None:
+            implicit = end - start + 1 > cls.IMPLICIT_THRESHOLD
+        return SegmentedPool(
+            start, end, segment_count,
+            max_gaps=cls.IMPLICIT_MAX_GAPS if implicit else None,
+            rng=rng,
+            gap_fraction=gap_fraction
+        )
+
+    @classmethod
+    def create_heaps(cls, pool: SegmentedPool) -> Tuple[MinHeap, MaxHeap]:
+        """Min and max heaps over the pool, shareable by every picker of that pool"""
+        # The pool yields ascending numbers, which already satisfy both heap orders
+        numbers = pool.get_all_numbers()
+        return MinHeap(numbers, presorted=True), MaxHeap(reversed(numbers), presorted=True)
+
+    def _initialize_structures(self, build_heaps: bool = True):
+        if self.implicit:
+            # Candidates are read straight from the pool by position
+            return
+
+        if build_heaps:
+            self.min_heap, self.max_heap = self.create_heaps(self.segmented_pool)
+        # A heap built from presorted numbers is the ascending pool itself
+        self.deque.extend(self.min_heap.heap)
+
+    def save(self, path: str):
+        """Write the complete picker state to a single binary file"""
+        from src.PickerSnapshot import PickerSnapshot
+        PickerSnapshot.save(self, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'RandomPicker':
+        """Restore a picker saved with save(); it continues the same stream"""
+        from src.PickerSnapshot import PickerSnapshot
+        return PickerSnapshot.load(path, cls)
+
+    def enable_profiling(self, profiler: Optional[PickProfiler] = None) -> PickProfiler:
+        """Start timing every pick stage; returns the profiler collecting the data"""
+        self.disable_profiling()
+        self.profiler = profiler if profiler is not None else PickProfiler()
+        self.profiler.attach(self)
+        return self.profiler
+
+    def disable_profiling(self):
+        if self.profiler is not None:
+            self.profiler.detach()
+            self.profiler = None
 
     def pick(self) -> int:
         # 1. Get candidate numbers using multi-position strategy
-        candidates = self.selection_strategy.select_candidates(
-            self.deque,
-            self.min_heap,
-            self.max_heap
-        )
+        if self.implicit:
+            candidates = self.selection_strategy.select_pool_candidates(self.segmented_pool)
+        else:
+            candidates = self.selection_strategy.select_candidates(
+                self.deque,
+                self.min_heap,
+                self.max_heap
+            )
 
         # 2. Apply transformations
         transformed = self._apply_transformations(candidates)
@@ -55,17 +144,257 @@ class RandomPicker:
         # 3. Enhanced final number selection
         final_number = self._select_final_number(transformed)
 
-        # 4. Periodic shuffling (every 7 picks instead of 10)
-        if self.selection_strategy.pick_count % 7 == 0:
-            self.deque.shuffle()
+        # 4. Incremental shuffling, with the read positions moved every 7 picks
+        if self.implicit:
+            if self.selection_strategy.pick_count % 7 == 0:
+                self.selection_strategy.rotate_pool(self.segmented_pool)
+        else:
+            self.deque.shuffle_step(self.SHUFFLE_STEPS)
+            if self.selection_strategy.pick_count % 7 == 0:
+                self.deque.rotate(self.rng.randrange(len(self.deque)))
 
         # 5. Store in history for distribution analysis
         self.history.append(final_number)
-        if len(self.history) > 1000:  # Keep history manageable
-            self.history.pop(0)
 
         return final_number
 
+    def pick_many(self, n: int) -> np.ndarray:
+        """Generate n numbers at once as an int64 array.
+
+        Statistically equivalent to calling pick() n times: every pick draws
+        candidates from the same slots, transforms each one in a random
+        transformer order and picks uniformly between the same final
+        strategies. Differences: the deque read positions move once per batch
+        rather than every 7 picks (later epochs read the slots of an
+        independently shuffled deque), the deque is shuffled in one vectorized
+        step and transformed values are reduced to 64 bits. Picks that choose
+        Strategy 4 see the history of every earlier pick, as pick() does.
+        """
+        if n <= 0:
+            return np.empty(0, dtype=np.int64)
+
+        # 1. Candidate numbers for every pick
+        if self.implicit:
+            current = self.selection_strategy.pool_slots(self.segmented_pool)
+        else:
+            current = [self.deque[0], self.deque[1], self.deque[-1],
+                       self.deque[-2], self.deque.get_middle()]
+        shuffles_before = self.selection_strategy.pick_count // 7
+        candidates, mask = self.selection_strategy.select_candidates_batch(
+            self.segmented_pool, n, self.np_rng, current, self.implicit
+        )
+
+        # 2. Transform every drawn candidate
+        transformed = np.zeros(candidates.shape, dtype=np.uint64)
+        transformed[mask] = self._apply_transformations_batch(candidates[mask].astype(np.uint64))
+
+        # 3. Final number selection, then the history-driven Strategy 4 picks in order
+        results, sparse_picks = self._select_final_numbers(transformed, mask)
+        fed = 0
+        for i in sparse_picks.tolist():
+            # History up to the previous pick, as pick() would have it
+            self.history.extend(results[max(fed, i - self.history.capacity):i].tolist())
+            results[i] = self._generate_number_in_sparse_region()
+            fed = i
+        self.history.extend(results[max(fed, n - self.history.capacity):].tolist())
+
+        # 4. Shuffle as many slots as n picks would swap, moving the read positions once
+        if not self.implicit:
+            self.deque.shuffle_slots(n * self.SHUFFLE_STEPS, self.np_rng)
+        if self.selection_strategy.pick_count // 7 > shuffles_before:
+            if self.implicit:
+                self.selection_strategy.rotate_pool(self.segmented_pool)
+            else:
+                self.deque.rotate(self.rng.randrange(len(self.deque)))
+
+        return results
+
+    def sample(self, k: int, unique: bool = True) -> np.ndarray:
+        """k numbers drawn uniformly from the pool's available numbers, as an int64 array.
+
+        Positions in the pool are sampled and mapped through kth_array, so
+        excluded gaps are respected and the range is never materialized.
+        Unique sparse samples reject repeated positions in vectorized rounds,
+        dense ones (k above 1/SAMPLE_DENSE_RATIO of the pool) take a prefix
+        of a shuffled position array; both cost O(k) time and memory.
+        Samples bypass the transformation pipeline and history.
+        """
+        count = self.segmented_pool.count()
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        if unique and k > count:
+            raise ValueError(f"cannot draw {k} unique numbers from {count} available")
+
+        if not unique:
+            positions = self.np_rng.integers(0, count, k)
+        elif k * self.SAMPLE_DENSE_RATIO > count:
+            positions = self.np_rng.permutation(count)[:k]
+        else:
+            positions = self._sample_sparse_positions(count, k)
+        return self.segmented_pool.kth_array(positions)
+
+    def set_weights(self, segments: Optional[Sequence[float]] = None, regions: Optional[Sequence[float]] = None,
+                    pmf: Optional[Sequence[float]] = None, block_size: int = 1024):
+        """Weight the pool's segments, the history regions, or every number in the range.
+
+        Exactly one of segments (one weight per segment), regions (one per
+        history region) or pmf (one per number from start to end) is given;
+        none clears the weights. pick_weighted() then draws a bin from an
+        alias table in O(1) and, for segments and regions, a uniformly
+        chosen available number inside it. Bins without available numbers,
+        including pmf entries of excluded numbers, must have weight zero.
+        """
+        given = [(kind, weights) for kind, weights in
+                 [('segments', segments), ('regions', regions), ('pmf', pmf)] if weights is not None]
+        if len(given) > 1:
+            raise ValueError("give only one of segments, regions or pmf")
+        if not given:
+            self.weight_kind = None
+            self.weight_table = None
+            return
+
+        kind, weights = given[0]
+        expected = {'segments': len(self.segmented_pool.segments),
+                    'regions': self.history.region_count,
+                    'pmf': self.range}[kind]
+        if len(weights) != expected:
+            raise ValueError(f"expected {expected} {kind} weights, got {len(weights)}")
+
+        if kind != 'pmf':
+            if kind == 'segments':
+                bounds = self.segmented_pool.segments
+            else:
+                bounds = [self.history.region_bounds(region) for region in range(expected)]
+            # Available numbers of each bin occupy pool positions [first, first + size)
+            first = np.array([self.segmented_pool.rank(low) for low, _ in bounds], dtype=np.int64)
+            after = np.array([self.segmented_pool.rank(high + 1) for _, high in bounds], dtype=np.int64)
+            self._weight_first, self._weight_sizes = first, after - first
+            self._check_weighted_bins(np.arange(expected), weights)
+        else:
+            offsets = np.asarray(self.segmented_pool.excluded_numbers, dtype=np.int64) - self.start
+            self._check_pmf_weights(offsets.tolist(), np.asarray(weights)[offsets].tolist())
+
+        self.weight_table = AliasTable(weights, block_size)
+        self.weight_kind = kind
+
+    def update_weights(self, indices: Sequence[int], weights: Sequence[float]):
+        """Change some weights, rebuilding only the affected alias table blocks"""
+        if self.weight_table is None:
+            raise RuntimeError("no weights set, call set_weights() first")
+        if self.weight_kind == 'pmf':
+            self._check_pmf_weights(indices, weights)
+        else:
+            self._check_weighted_bins(indices, weights)
+        self.weight_table.update(indices, weights)
+
+    def pick_weighted(self) -> int:
+        """One number drawn according to the weights, in O(1); history is not touched"""
+        if self.weight_table is None:
+            raise RuntimeError("no weights set, call set_weights() first")
+        index = self.weight_table.draw(self.rng)
+        if self.weight_kind == 'pmf':
+            return self.start + index
+        position = int(self._weight_first[index]) + self.rng.randrange(int(self._weight_sizes[index]))
+        return self.segmented_pool.kth(position)
+
+    def pick_weighted_many(self, n: int) -> np.ndarray:
+        """n weighted numbers as an int64 array"""
+        if self.weight_table is None:
+            raise RuntimeError("no weights set, call set_weights() first")
+        indices = self.weight_table.draw_array(n, self.np_rng)
+        if self.weight_kind == 'pmf':
+            return self.start + indices
+        positions = self._weight_first[indices] + self.np_rng.integers(0, self._weight_sizes[indices])
+        return self.segmented_pool.kth_array(positions)
+
+    def _check_weighted_bins(self, indices: Sequence[int], weights: Sequence[float]):
+        for index, weight in zip(indices, weights):
+            if weight > 0 and self._weight_sizes[index] == 0:
+                raise ValueError(f"bin {index} has no available numbers and cannot get a weight")
+
+    def _check_pmf_weights(self, indices: Sequence[int], weights: Sequence[float]):
+        for index, weight in zip(indices, weights):
+            if weight > 0 and self.start + index not in self.segmented_pool:
+                raise ValueError(f"{self.start + index} is excluded by a gap and cannot get a weight")
+
+    def permutation(self, seed: Optional[int] = None, position: int = 0) -> PoolPermutation:
+        """Iterator over every available number once, resumable from (seed, position)"""
+        return PoolPermutation(self.segmented_pool, seed, position=position)
+
+    def _sample_sparse_positions(self, count: int, k: int) -> np.ndarray:
+        """k distinct positions in draw order, drawing and dropping repeats in rounds"""
+        drawn = np.empty(0, dtype=np.int64)
+        while len(drawn) < k:
+            missing = k - len(drawn)
+            # Oversample slightly so one round usually suffices
+            combined = np.concatenate([drawn, self.np_rng.integers(0, count, missing + missing // 8 + 16)])
+            _, first = np.unique(combined, return_index=True)
+            first.sort()
+            drawn = combined[first]
+        return drawn[:k]
+
+    def stream(self, chunk_size: int = 65536, total: Optional[int] = None) -> Iterator[np.ndarray]:
+        """Yield pick_many(chunk_size) arrays, forever or until total numbers were produced"""
+        produced = 0
+        while total is None or produced < total:
+            size = chunk_size if total is None else min(chunk_size, total - produced)
+            yield self.pick_many(size)
+            produced += size
+
+    def _apply_transformations_batch(self, numbers: np.ndarray) -> np.ndarray:
+        transformers = [
+            self.bitwise_transformer.transform_batch,
+            self.math_transformer.transform_batch,
+            self.hash_transformer.transform_batch
+        ]
+        orders = list(itertools.permutations(transformers))
+
+        # Every number gets one of the 6 orders, numbers sharing one are transformed together
+        order_ids = self.np_rng.integers(0, len(orders), len(numbers))
+        transformed = np.empty_like(numbers)
+        for order_id, order in enumerate(orders):
+            selected = order_ids == order_id
+            if not selected.any():
+                continue
+            group = numbers[selected]
+            for transformer in order:
+                group = transformer(group, self.np_rng)
+            transformed[selected] = group
+
+        return transformed
+
+    def _select_final_numbers(self, transformed: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Numbers of Strategies 1-3 and the indices of the picks that choose Strategy 4.
+
+        Strategy 4 depends on the history of every earlier pick, so its
+        numbers are left for the caller to draw in order.
+        """
+        n = len(transformed)
+        span = np.uint64(self.range)
+        candidates = np.empty((n, 3), dtype=np.int64)
+
+        # Strategy 1: Basic modulo
+        candidates[:, 0] = (transformed[:, 0] % span).astype(np.int64)
+
+        # Strategy 2: Reverse bits of the second candidate then modulo
+        second = np.where(mask[:, 1], transformed[:, 1], transformed[:, 2])
+        candidates[:, 1] = (BitwiseTransformer.reverse_bits_batch(second) % span).astype(np.int64)
+
+        # Strategy 3: XOR all transformed numbers (undrawn slots hold zero)
+        xor_result = np.bitwise_xor.reduce(transformed, axis=1)
+        candidates[:, 2] = (xor_result % span).astype(np.int64)
+        candidates += self.start
+
+        # Strategy 4 (distribution analysis) is available once history exists
+        strategy_counts = np.full(n, 4)
+        if not self.history:
+            strategy_counts[0] = 3
+
+        # Final selection: randomly choose from candidates
+        choice = self.np_rng.integers(0, strategy_counts)
+        sparse_picks = np.flatnonzero(choice == 3)
+        return candidates[np.arange(n), np.minimum(choice, 2)], sparse_picks
+
     def _select_final_number(self, transformed: List[int]) -> int:
         # Apply multiple selection strategies
         candidates = []
@@ -87,13 +416,10 @@ class RandomPicker:
 
         # Strategy 4: Use distribution analysis if history exists
         if self.history:
-            least_frequent_regions = self._find_least_frequent_regions()
-            number4 = self._generate_number_in_region(least_frequent_regions)
-            if number4 is not None:
-                candidates.append(number4)
+            candidates.append(self._generate_number_in_sparse_region())
 
         # Final selection: randomly choose from candidates
-        return random.choice(candidates)
+        return self.rng.choice(candidates)
 
     def _reverse_bits(self, n: int) -> int:
         result = 0
@@ -103,38 +429,12 @@ class RandomPicker:
         return result
 
     def _find_least_frequent_regions(self) -> List[Tuple[int, int]]:
-        if not self.history:
-            return [(self.start, self.end)]
-
-        # Divide range into 10 regions
-        region_size = max(1, self.range // 10)
-        regions = []
-        counts = [0] * 10
-
-        # Count numbers in each region
-        for num in self.history:
-            region_index = min(9, (num - self.start) // region_size)
-            counts[region_index] += 1
-
-        # Find regions with below-average counts
-        avg_count = statistics.mean(counts)
-        least_frequent = []
-
-        for i, count in enumerate(counts):
-            if count < avg_count:
-                region_start = self.start + (i * region_size)
-                region_end = min(self.end, region_start + region_size - 1)
-                least_frequent.append((region_start, region_end))
-
-        return least_frequent or [(self.start, self.end)]
-
-    def _generate_number_in_region(self, regions: List[Tuple[int, int]]) -> int:
-        if not regions:
-            return None
+        return self.history.sparse_regions()
 
-        # Select random region and generate number within it
-        start, end = random.choice(regions)
-        return random.randint(start, end)
+    def _generate_number_in_sparse_region(self) -> int:
+        # Select random below-average region and generate number within it
+        start, end = self.history.random_sparse_region()
+        return self.rng.randint(start, end)
 
     def _apply_transformations(self, numbers: List[int]) -> List[int]:
         transformed = []
@@ -145,7 +445,7 @@ class RandomPicker:
                 self.math_transformer.transform,
                 self.hash_transformer.transform
             ]
-            random.shuffle(transformers)
+            self.rng.shuffle(transformers)
 
             for transformer in transformers:
                 num = transformer(num)
@@ -0,0 +1,57 @@
+from typing import Tuple
+import numpy as np
+
+class Downsampler:
+    """Reduce a long series to a fixed number of points for plotting"""
+
+    def __init__(self, point_budget: int = 2000):
+        if point_budget < 4:
+            raise ValueError("point_budget must be at least 4")
+        self.point_budget = point_budget
+
+    def lttb(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Largest-Triangle-Three-Buckets: keeps the visual shape of a line.
+
+        Returns the kept indices and their values, always including the
+        first and last point.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        if n <= self.point_budget:
+            return np.arange(n), values
+
+        # point_budget - 2 buckets between the fixed first and last points
+        edges = np.append(np.linspace(1, n - 1, self.point_budget - 1).astype(np.int64), n)
+        kept = np.empty(self.point_budget, dtype=np.int64)
+        kept[0] = previous = 0
+        for bucket in range(self.point_budget - 2):
+            low, high = edges[bucket], edges[bucket + 1]
+            next_low, next_high = edges[bucket + 1], edges[bucket + 2]
+            average_x = (next_low + next_high - 1) / 2
+            average_y = values[next_low:next_high].mean()
+
+            # Point forming the largest triangle with the previous pick and the next bucket's mean
+            xs = np.arange(low, high)
+            areas = np.abs((previous - average_x) * (values[low:high] - values[previous]) -
+                           (previous - xs) * (average_y - values[previous]))
+            previous = kept[bucket + 1] = low + int(np.argmax(areas))
+        kept[-1] = n - 1
+        return kept, values[kept]
+
+    def min_max(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Keep the minimum and maximum of every bucket, so spikes survive"""
+        values = np.asarray(values)
+        n = len(values)
+        if n <= self.point_budget:
+            return np.arange(n), values
+
+        buckets = self.point_budget // 2
+        size = -(-n // buckets)
+        # Pad the tail with its last value so every bucket has the same width
+        padded = np.concatenate([values, np.repeat(values[-1:], size * buckets - n)]).reshape(buckets, size)
+        offsets = np.arange(buckets) * size
+        lows = offsets + padded.argmin(axis=1)
+        highs = offsets + padded.argmax(axis=1)
+        kept = np.minimum(np.sort(np.stack([lows, highs], axis=1), axis=1).ravel(), n - 1)
+        kept = np.unique(kept)
+        return kept, values[kept]
@@ -0,0 +1,246 @@
+import math
+from typing import Dict, Iterable, Optional
+import numpy as np
+
+class QualityBattery:
+    """Statistical tests over a stream of numbers in [start, end], fed chunk by chunk.
+
+    Every test keeps only counters and a few carried values between chunks,
+    so memory does not grow with the number of samples:
+    - chi-square uniformity over equal-width bins
+    - Wald-Wolfowitz runs above/below the middle of the range
+    - lag-1 serial correlation
+    - Knuth's gap test on the lowest tenth of the range
+    - Marsaglia's birthday spacings over a 2^32 day year, consecutive numbers
+      are combined until they cover it and reduced by rejection
+    P-values are computed without scipy (regularized incomplete gamma, erfc).
+    """
+
+    MAX_BINS = 1024
+    GAP_FRACTION = 10  # The gap test hits the lowest 1/GAP_FRACTION of the range
+    MAX_GAP_CATEGORIES = 32
+    BIRTHDAY_YEAR = 2 ** 32  # Below this the Poisson approximation is noticeably biased
+    BIRTHDAY_DAYS = 4096  # Birthdays per sample, 4 duplicate spacings expected
+    def __init__(self, start: int, end: int):
+        if start >= end:
+            raise ValueError("start must be less than end")
+        self.start = start
+        self.end = end
+        self.size = end - start + 1
+        self.count = 0
+
+        # Chi-square: equal width bins, the last one may be narrower
+        self._bin_width = -(-self.size // self.MAX_BINS)
+        bins = -(-self.size // self._bin_width)
+        self._bin_counts = np.zeros(bins, dtype=np.int64)
+        self._bin_sizes = np.full(bins, self._bin_width, dtype=np.float64)
+        self._bin_sizes[-1] = self.size - self._bin_width * (bins - 1)
+
+        # Runs above/below the middle
+        self._half = self.size // 2
+        self._below = 0
+        self._runs = 0
+        self._last_below: Optional[bool] = None
+
+        # Serial correlation sums over (x[i], x[i+1]) pairs
+        self._pairs = 0
+        self._pair_sums = np.zeros(5)  # sum a, sum b, sum a^2, sum b^2, sum ab
+        self._last_unit: Optional[float] = None
+
+        # Gap test
+        self._gap_hits = max(1, self.size // self.GAP_FRACTION)
+        self._gap_probability = self._gap_hits / self.size
+        self._gap_categories = max(1, min(
+            self.MAX_GAP_CATEGORIES, int(math.log(0.05) / math.log(1 - self._gap_probability))
+        ))
+        self._gap_counts = np.zeros(self._gap_categories + 1, dtype=np.int64)
+        self._last_hit: Optional[int] = None  # Stream index of the previous hit
+
+        # Birthday spacings
+        self._digits = 1
+        year = self.size
+        while year < self.BIRTHDAY_YEAR:
+            self._digits += 1
+            year *= self.size
+        # Combined values at or above the last whole multiple of the year are dropped
+        self._birthday_limit = np.uint64(year - year % self.BIRTHDAY_YEAR)
+        self._birthday_lambda = self.BIRTHDAY_DAYS ** 3 / (4 * self.BIRTHDAY_YEAR)
+        self._birthday_samples = 0
+        self._birthday_duplicates = 0
+        self._carried_digits = np.empty(0, dtype=np.uint64)
+        self._carried_days = np.empty(0, dtype=np.uint64)
+
+    def run(self, chunks: Iterable[np.ndarray]) -> Dict[str, Dict[str, float]]:
+        for chunk in chunks:
+            self.update(chunk)
+        return self.results()
+
+    def update(self, numbers: np.ndarray):
+        positions = np.asarray(numbers, dtype=np.int64) - self.start
+        if len(positions) == 0:
+            return
+        if positions.min() < 0 or positions.max() >= self.size:
+            raise ValueError("numbers outside [start, end]")
+
+        self._update_chi_square(positions)
+        self._update_runs(positions)
+        self._update_serial_correlation(positions)
+        self._update_gaps(positions)
+        self._update_birthdays(positions)
+        self.count += len(positions)
+
+    def _update_chi_square(self, positions: np.ndarray):
+        self._bin_counts += np.bincount(positions // self._bin_width, minlength=len(self._bin_counts))
+
+    def _update_runs(self, positions: np.ndarray):
+        below = positions < self._half
+        self._below += int(below.sum())
+        self._runs += int(np.count_nonzero(below[1:] != below[:-1]))
+        if self._last_below is None or self._last_below != below[0]:
+            self._runs += 1
+        self._last_below = bool(below[-1])
+
+    def _update_serial_correlation(self, positions: np.ndarray):
+        units = positions / self.size - 0.5
+        if self._last_unit is not None:
+            units = np.concatenate([[self._last_unit], units])
+        first, second = units[:-1], units[1:]
+        self._pairs += len(first)
+        self._pair_sums += [first.sum(), second.sum(), (first * first).sum(),
+                            (second * second).sum(), (first * second).sum()]
+        self._last_unit = float(units[-1])
+
+    def _update_gaps(self, positions: np.ndarray):
+        hits = np.flatnonzero(positions < self._gap_hits) + self.count
+        if len(hits) == 0:
+            return
+        if self._last_hit is not None:
+            hits = np.concatenate([[self._last_hit], hits])
+        gaps = np.minimum(np.diff(hits) - 1, self._gap_categories)
+        self._gap_counts += np.bincount(gaps, minlength=len(self._gap_counts))
+        self._last_hit = int(hits[-1])
+
+    def _update_birthdays(self, positions: np.ndarray):
+        digits = np.concatenate([self._carried_digits, positions.astype(np.uint64)])
+        values = len(digits) // self._digits
+        self._carried_digits = digits[values * self._digits:]
+
+        # Read each group of digits as a base-size number, then fold it onto the year
+        digits = digits[:values * self._digits].reshape(values, self._digits)
+        combined = np.zeros(values, dtype=np.uint64)
+        for digit in range(self._digits):
+            combined = combined * np.uint64(self.size) + digits[:, digit]
+        days = combined[combined < self._birthday_limit] % np.uint64(self.BIRTHDAY_YEAR)
+
+        days = np.concatenate([self._carried_days, days])
+        samples = len(days) // self.BIRTHDAY_DAYS
+        self._carried_days = days[samples * self.BIRTHDAY_DAYS:]
+        if samples == 0:
+            return
+
+        days = np.sort(days[:samples * self.BIRTHDAY_DAYS].reshape(samples, self.BIRTHDAY_DAYS), axis=1)
+        spacings = np.sort(np.diff(days, axis=1), axis=1)
+        self._birthday_duplicates += int(np.count_nonzero(spacings[:, 1:] == spacings[:, :-1]))
+        self._birthday_samples += samples
+
+    def results(self) -> Dict[str, Dict[str, float]]:
+        """Statistic and p-value per test; tests without enough data are left out"""
+        results = {}
+        if self.count >= 2:
+            expected = self._bin_sizes * (self.count / self.size)
+            statistic = float(((self._bin_counts - expected) ** 2 / expected).sum())
+            degrees = len(self._bin_counts) - 1
+            if degrees > 0:
+                results['chi_square'] = {'statistic': statistic, 'degrees_of_freedom': degrees,
+                                         'p_value': self.chi_square_sf(statistic, degrees)}
+
+            above = self.count - self._below
+            if self._below and above:
+                mean = 2 * self._below * above / self.count + 1
+                variance = (mean - 1) * (mean - 2) / (self.count - 1)
+                if variance > 0:
+                    z = (self._runs - mean) / math.sqrt(variance)
+                    results['runs'] = {'statistic': z, 'runs': self._runs, 'p_value': self.normal_two_sided(z)}
+
+        if self._pairs >= 3:
+            sum_a, sum_b, sum_aa, sum_bb, sum_ab = self._pair_sums
+            n = self._pairs
+            covariance = sum_ab - sum_a * sum_b / n
+            spread = math.sqrt(max(sum_aa - sum_a ** 2 / n, 0) * max(sum_bb - sum_b ** 2 / n, 0))
+            if spread > 0:
+                correlation = covariance / spread
+                z = correlation * math.sqrt(n)
+                results['serial_correlation'] = {'statistic': correlation, 'p_value': self.normal_two_sided(z)}
+
+        gaps = int(self._gap_counts.sum())
+        if gaps:
+            miss = 1 - self._gap_probability
+            probabilities = [self._gap_probability * miss ** length for length in range(self._gap_categories)]
+            probabilities.append(miss ** self._gap_categories)
+            expected = np.array(probabilities) * gaps
+            statistic = float(((self._gap_counts - expected) ** 2 / expected).sum())
+            results['gap'] = {'statistic': statistic, 'degrees_of_freedom': self._gap_categories, 'gaps': gaps,
+                              'p_value': self.chi_square_sf(statistic, self._gap_categories)}
+
+        if self._birthday_samples:
+            # The duplicate count over all samples is Poisson distributed
+            expected = self._birthday_lambda * self._birthday_samples
+            observed = self._birthday_duplicates
+            lower = self.gamma_q(observed + 1, expected)  # P(X <= observed)
+            upper = 1.0 - self.gamma_q(observed, expected) if observed else 1.0  # P(X >= observed)
+            results['birthday_spacings'] = {'statistic': observed, 'expected': expected,
+                                            'samples': self._birthday_samples,
+                                            'p_value': min(1.0, 2 * min(lower, upper))}
+        return results
+
+    def report(self) -> str:
+        lines = [f"{self.count:,} numbers in [{self.start}, {self.end}]"]
+        for name, result in self.results().items():
+            lines.append(f"  {name:<20} statistic={result['statistic']:<14.6g} p={result['p_value']:.4f}")
+        return '\n'.join(lines)
+
+    @staticmethod
+    def normal_two_sided(z: float) -> float:
+        return math.erfc(abs(z) / math.sqrt(2))
+
+    @classmethod
+    def chi_square_sf(cls, statistic: float, degrees: int) -> float:
+        return cls.gamma_q(degrees / 2, statistic / 2)
+
+    @staticmethod
+    def gamma_q(a: float, x: float) -> float:
+        """Regularized upper incomplete gamma Q(a, x), as in Numerical Recipes"""
+        if x <= 0:
+            return 1.0
+        log_prefix = -x + a * math.log(x) - math.lgamma(a)
+        if x < a + 1:
+            # Series for P(a, x)
+            term = total = 1 / a
+            denominator = a
+            for _ in range(100_000):
+                denominator += 1
+                term *= x / denominator
+                total += term
+                if abs(term) < abs(total) * 1e-15:
+                    break
+            return max(0.0, 1.0 - total * math.exp(log_prefix))
+
+        # Lentz's continued fraction for Q(a, x)
+        tiny = 1e-300
+        b = x + 1 - a
+        c = 1 / tiny
+        d = 1 / b
+        h = d
+        for i in range(1, 100_000):
+            an = -i * (i - a)
+            b += 2
+            d = an * d + b
+            d = tiny if abs(d) < tiny else d
+            c = b + an / c
+            c = tiny if abs(c) < tiny else c
+            d = 1 / d
+            delta = d * c
+            h *= delta
+            if abs(delta - 1) < 1e-15:
+                break
+        return min(1.0, h * math.exp(log_prefix))
@@ -0,0 +1,140 @@
+import math
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, Optional
+import numpy as np
+from src.analysis.P2Quantile import P2Quantile
+
+class StreamingStats:
+    """Summary statistics updated per number instead of recomputed over the history.
+
+    Mean and variance use Welford's algorithm (Chan's merge for batches),
+    mode and unique count come from a value-count table, and the median is
+    exact while few distinct values have been seen and a P-square estimate
+    beyond that. The running mean after every number is stored so
+    a history table never has to re-sum its prefix.
+    """
+
+    # Distinct values up to which the median is read off the value counts
+    EXACT_MEDIAN_LIMIT = 4096
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # Sum of squared deviations from the mean
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+        self.value_counts = Counter()
+        self.mode: Optional[int] = None
+        self._mode_count = 0
+        self._median = P2Quantile(0.5)
+        self._total = 0  # Exact integer sum behind the running means
+        self.running_means = array('d')
+
+    def add(self, number: int):
+        self.count += 1
+        delta = number - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (number - self.mean)
+
+        if self.min is None or number < self.min:
+            self.min = number
+        if self.max is None or number > self.max:
+            self.max = number
+
+        self._count_value(number)
+        self._median.add(number)
+        self._total += number
+        self.running_means.append(self._total / self.count)
+
+    def extend(self, numbers: Iterable[int]):
+        numbers = [int(number) for number in numbers]
+        if not numbers:
+            return
+        values = np.array(numbers, dtype=np.float64)
+
+        # Merge the batch moments into the running ones
+        batch_count = len(numbers)
+        batch_mean = values.mean()
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        combined = self.count + batch_count
+        delta = batch_mean - self.mean
+        self._m2 += batch_m2 + delta * delta * self.count * batch_count / combined
+        self.mean += delta * batch_count / combined
+
+        batch_min, batch_max = min(numbers), max(numbers)
+        self.min = batch_min if self.min is None else min(self.min, batch_min)
+        self.max = batch_max if self.max is None else max(self.max, batch_max)
+
+        for number in numbers:
+            self._count_value(number)
+            self._median.add(number)
+
+        totals = self._total + np.cumsum(np.array(numbers, dtype=object))
+        self.running_means.extend((totals / np.arange(self.count + 1, combined + 1)).astype(np.float64))
+        self._total = int(totals[-1])
+        self.count = combined
+
+    def _count_value(self, number: int):
+        seen = self.value_counts[number] + 1
+        self.value_counts[number] = seen
+        # Ties keep the value that reached the count first
+        if seen > self._mode_count:
+            self._mode_count = seen
+            self.mode = number
+
+    @property
+    def unique(self) -> int:
+        return len(self.value_counts)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count >= 2 else math.nan
+
+    @property
+    def std_dev(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def median(self) -> float:
+        if self.count == 0 or self.unique > self.EXACT_MEDIAN_LIMIT:
+            return self._median.value()
+
+        # Walk the sorted counts to the middle element(s)
+        lower_rank, upper_rank = (self.count - 1) // 2, self.count // 2
+        lower = None
+        seen = 0
+        for value in sorted(self.value_counts):
+            seen += self.value_counts[value]
+            if lower is None and seen > lower_rank:
+                lower = value
+            if seen > upper_rank:
+                return (lower + value) / 2
+
+    def summary(self) -> Dict:
+        """Display values in the layout the dashboard metrics expect"""
+        stats = {
+            'count': self.count,
+            'mean': 'N/A',
+            'median': 'N/A',
+            'std_dev': 'N/A',
+            'min': 'N/A',
+            'max': 'N/A',
+            'mode': 'N/A',
+            'unique': self.unique
+        }
+
+        if self.count:
+            stats['mean'] = f"{self.mean:.2f}"
+            stats['min'] = self.min
+            stats['max'] = self.max
+
+            if self.count >= 2:
+                stats['std_dev'] = f"{self.std_dev:.2f}"
+                stats['median'] = f"{self.median:.2f}"
+                stats['mode'] = f"{self.mode}"
+
+        return stats
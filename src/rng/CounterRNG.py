@@ -0,0 +1,95 @@
+import hashlib
+import os
+import random
+import numpy as np
+
+MASK64 = (1 << 64) - 1
+
+# SplitMix64 constants
+_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MUL1 = np.uint64(0xBF58476D1CE4E5B9)
+_MUL2 = np.uint64(0x94D049BB133111EB)
+
+class CounterRNG(random.Random):
+    """Counter-based drop-in for random.Random.
+
+    Word i of the stream is SplitMix64(key + (i + 1) * gamma), so any
+    position can be computed directly: skip(n) is O(1), and words are
+    produced in blocks with NumPy instead of one getrandbits call at a time.
+    All random.Random methods (randint, choice, shuffle, ...) build on it.
+    """
+
+    VERSION = 'counter-v1'
+    BLOCK_SIZE = 4096
+
+    def __init__(self, seed=None):
+        self.key = 0
+        self.position = 0  # Index of the next word
+        self._block = []
+        self._block_start = 0
+        super().__init__(seed)
+
+    def seed(self, a=None, version=2):
+        if a is None:
+            key = int.from_bytes(os.urandom(8), 'little')
+        elif isinstance(a, int):
+            # Fold arbitrary ints (including negatives) into a 64-bit key
+            key = int(np.random.SeedSequence(abs(a)).generate_state(1, np.uint64)[0]) ^ (a < 0)
+        else:
+            if isinstance(a, str):
+                a = a.encode()
+            key = int.from_bytes(hashlib.sha512(bytes(a)).digest()[:8], 'little')
+        self.key = key
+        self.position = 0
+        self._block = []
+        self._block_start = 0
+        self.gauss_next = None
+
+    def getstate(self):
+        return self.VERSION, self.key, self.position, self.gauss_next
+
+    def setstate(self, state):
+        version, self.key, self.position, self.gauss_next = state
+        if version != self.VERSION:
+            raise ValueError(f"state with version {version} passed to CounterRNG")
+        self._block = []
+        self._block_start = 0
+
+    def skip(self, n: int):
+        """Advance the stream by n 64-bit words in O(1)"""
+        self.position += n
+
+    def words(self, n: int, position: int) -> np.ndarray:
+        """The n words starting at a stream position, as a uint64 array"""
+        counters = np.arange(n, dtype=np.uint64) + np.uint64((position + 1) & MASK64)
+        z = counters * _GAMMA + np.uint64(self.key)
+        z = (z ^ (z >> np.uint64(30))) * _MUL1
+        z = (z ^ (z >> np.uint64(27))) * _MUL2
+        return z ^ (z >> np.uint64(31))
+
+    def random_raw(self, n: int) -> np.ndarray:
+        """Consume the next n words in bulk"""
+        block = self.words(n, self.position)
+        self.position += n
+        return block
+
+    def _next_word(self) -> int:
+        index = self.position - self._block_start
+        if not 0 <= index < len(self._block):
+            self._block = self.words(self.BLOCK_SIZE, self.position).tolist()
+            self._block_start = self.position
+            index = 0
+        self.position += 1
+        return self._block[index]
+
+    def random(self) -> float:
+        return (self._next_word() >> 11) * (1.0 / (1 << 53))
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        word_count = (k + 63) // 64
+        result = 0
+        for _ in range(word_count):
+            result = (result << 64) | self._next_word()
+        return result >> (word_count * 64 - k)
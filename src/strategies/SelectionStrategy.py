@@ -1,31 +1,147 @@
 import random
-from typing import List
+import numpy as np
+from typing import List, Optional, Tuple
 from src.structures.MinHeap import MinHeap
 from src.structures.MaxHeap import MaxHeap
 from src.structures.CustomDeque import CustomDeque
+from src.structures.SegmentedPool import SegmentedPool
 
 class SelectionStrategy:
-    def __init__(self):
+    # Candidate slots per pick: front, second, back, second to last, middle, extreme, random
+    CANDIDATE_SLOTS = 7
+    # Extreme candidates are drawn among this many smallest and largest numbers
+    EXTREME_WINDOW = 3
+    # Slots 1 and 3 are only drawn half of the time
+    OPTIONAL_SLOTS = (1, 3)
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng if rng is not None else random.Random()
         self.pick_count = 0
+        self.pool_offset = 0  # Rotation applied to implicit pool positions
 
     def select_candidates(self, deque: CustomDeque, min_heap: MinHeap, max_heap: MaxHeap) -> List[int]:
         candidates = []
 
         # Get 1-2 numbers from beginning
-        candidates.append(deque.deque[0])
-        if random.random() < 0.5:
-            candidates.append(deque.deque[1])
+        candidates.append(deque[0])
+        if self.rng.random() < 0.5:
+            candidates.append(deque[1])
 
         # Get 1-2 numbers from end
-        candidates.append(deque.deque[-1])
-        if random.random() < 0.5:
-            candidates.append(deque.deque[-2])
+        candidates.append(deque[-1])
+        if self.rng.random() < 0.5:
+            candidates.append(deque[-2])
 
         # Get 1-2 numbers from middle
         candidates.append(deque.get_middle())
 
+        # Get 1 number near either extreme
+        extremes = min_heap.peek_k(self.EXTREME_WINDOW) + max_heap.peek_k(self.EXTREME_WINDOW)
+        candidates.append(self.rng.choice(extremes))
+
         # Get 1-2 random numbers
-        candidates.append(random.choice(list(deque.deque)))
+        candidates.append(deque.random_item())
 
         self.pick_count += 1
         return candidates
+
+    def select_pool_candidates(self, pool: SegmentedPool) -> List[int]:
+        """Same positions as select_candidates, read from an implicit pool"""
+        count = pool.count()
+
+        def at(position: int) -> int:
+            return pool.kth((self.pool_offset + position) % count)
+
+        candidates = []
+
+        # Get 1-2 numbers from beginning
+        candidates.append(at(0))
+        if self.rng.random() < 0.5:
+            candidates.append(at(1))
+
+        # Get 1-2 numbers from end
+        candidates.append(at(-1))
+        if self.rng.random() < 0.5:
+            candidates.append(at(-2))
+
+        # Get 1-2 numbers from middle
+        candidates.append(at(count // 2))
+
+        # Get 1 number near either extreme
+        candidates.append(pool.kth(self._extreme_position(self.rng.randrange(2 * self.EXTREME_WINDOW), count)))
+
+        # Get 1-2 random numbers
+        candidates.append(pool.kth(self.rng.randrange(count)))
+
+        self.pick_count += 1
+        return candidates
+
+    def rotate_pool(self, pool: SegmentedPool):
+        """Implicit counterpart of shuffling the deque: move the read window"""
+        self.pool_offset = self.rng.randrange(pool.count())
+
+    def pool_slots(self, pool: SegmentedPool) -> List[int]:
+        """Front, second, back, second to last and middle of the implicit pool"""
+        count = pool.count()
+        positions = [0, 1, -1, -2, count // 2]
+        return [pool.kth((self.pool_offset + position) % count) for position in positions]
+
+    def select_candidates_batch(self, pool: SegmentedPool, n: int, rng: np.random.Generator,
+                                current: List[int], implicit: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized select_candidates for n consecutive picks.
+
+        Returns an (n, 7) int64 array of candidates in the order the scalar
+        strategy produces them, and a mask of the slots that were drawn.
+        Picks in the current 7-pick shuffle epoch read the `current` slot
+        values; later epochs read the slots of a freshly shuffled deque
+        (a freshly rotated window in implicit mode).
+        """
+        count = pool.count()
+        pick_numbers = self.pick_count + 1 + np.arange(n)
+        epochs = (pick_numbers - 1) // 7 - self.pick_count // 7
+        epoch_count = int(epochs[-1]) + 1 if n else 1
+
+        slots = np.empty((epoch_count, 5), dtype=np.int64)
+        slots[0] = current
+        if epoch_count > 1:
+            if implicit:
+                offsets = rng.integers(0, count, epoch_count - 1)
+                positions = (offsets[:, None] + np.array([0, 1, -1, -2, count // 2])) % count
+            else:
+                positions = self._shuffled_slot_positions(rng, count, epoch_count - 1)
+            slots[1:] = pool.kth_array(positions)
+
+        candidates = np.empty((n, self.CANDIDATE_SLOTS), dtype=np.int64)
+        candidates[:, :5] = slots[epochs]
+        extreme = rng.integers(0, 2 * self.EXTREME_WINDOW, n)
+        candidates[:, 5] = pool.kth_array(self._extreme_position(extreme, count))
+        candidates[:, 6] = pool.kth_array(rng.integers(0, count, n))
+
+        mask = np.ones((n, self.CANDIDATE_SLOTS), dtype=bool)
+        for slot in self.OPTIONAL_SLOTS:
+            mask[:, slot] = rng.random(n) < 0.5
+
+        self.pick_count += n
+        return candidates, mask
+
+    def _extreme_position(self, draw, count: int):
+        """Map a draw in [0, 2 * EXTREME_WINDOW) to a pool position near either end"""
+        window = min(self.EXTREME_WINDOW, count)
+        return (draw % window) + (draw >= self.EXTREME_WINDOW) * (count - window)
+
+    def _shuffled_slot_positions(self, rng: np.random.Generator, count: int, rows: int) -> np.ndarray:
+        """Positions that land in the five fixed slots after shuffling a deque of size count"""
+        if count < 5:
+            # Slots overlap in tiny deques, so shuffle them for real
+            perms = rng.permuted(np.tile(np.arange(count), (rows, 1)), axis=1)
+            return perms[:, np.array([0, 1, -1, -2, count // 2]) % count]
+
+        # Five distinct positions: draw among the untaken ones, then skip past taken ones
+        positions = np.empty((rows, 5), dtype=np.int64)
+        for j in range(5):
+            drawn = rng.integers(0, count - j, rows)
+            taken = np.sort(positions[:, :j], axis=1)
+            for column in range(j):
+                drawn += drawn >= taken[:, column]
+            positions[:, j] = drawn
+        return positions
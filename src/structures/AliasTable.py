@@ -0,0 +1,119 @@
+import random
+import numpy as np
+from typing import Iterable, Sequence, Tuple
+
+class AliasTable:
+    """Vose alias tables for O(1) draws from a discrete distribution.
+
+    Weights are split into blocks of block_size with one alias table per
+    block and one over the block totals. A draw picks a block, then an
+    entry within it, in O(1). Changing weights rebuilds only the touched
+    blocks plus the block-level table, O(block_size + blocks) per update
+    instead of O(n).
+    """
+
+    def __init__(self, weights: Iterable[float], block_size: int = 1024):
+        weights = np.array(weights, dtype=np.float64)
+        if weights.ndim != 1 or len(weights) == 0:
+            raise ValueError("weights must be a non-empty sequence")
+        self._check(weights)
+
+        self.block_size = min(block_size, len(weights))
+        self.block_count = -(-len(weights) // self.block_size)
+        # Pad to whole blocks, padding slots have zero weight and are never drawn
+        self.weights = np.zeros(self.block_count * self.block_size)
+        self.weights[:len(weights)] = weights
+        self._size = len(weights)
+
+        self._prob = np.empty(len(self.weights))
+        self._alias = np.empty(len(self.weights), dtype=np.int64)
+        self._block_totals = np.empty(self.block_count)
+        for block in range(self.block_count):
+            self._build_block(block)
+        self._build_top()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def total(self) -> float:
+        return float(self._block_totals.sum())
+
+    def probabilities(self) -> np.ndarray:
+        return self.weights[:self._size] / self.total
+
+    def draw(self, rng: random.Random) -> int:
+        block = rng.randrange(self.block_count)
+        if rng.random() >= self._top_prob[block]:
+            block = self._top_alias[block]
+        index = block * self.block_size + rng.randrange(self.block_size)
+        if rng.random() >= self._prob[index]:
+            index = self._alias[index]
+        return int(index)
+
+    def draw_array(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        """n independent draws as an int64 array"""
+        blocks = rng.integers(0, self.block_count, n)
+        blocks = np.where(rng.random(n) < self._top_prob[blocks], blocks, self._top_alias[blocks])
+        indices = blocks * self.block_size + rng.integers(0, self.block_size, n)
+        return np.where(rng.random(n) < self._prob[indices], indices, self._alias[indices])
+
+    def update(self, indices: Sequence[int], weights: Sequence[float]):
+        """Set new weights for some entries, rebuilding only their blocks"""
+        indices = np.asarray(indices, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(indices) and (indices.min() < 0 or indices.max() >= self._size):
+            raise IndexError("weight index out of range")
+
+        previous = self.weights[indices]
+        self.weights[indices] = weights
+        try:
+            self._check(self.weights)
+        except ValueError:
+            self.weights[indices] = previous
+            raise
+
+        for block in np.unique(indices // self.block_size).tolist():
+            self._build_block(block)
+        self._build_top()
+
+    def _build_block(self, block: int):
+        first = block * self.block_size
+        weights = self.weights[first:first + self.block_size]
+        self._block_totals[block] = weights.sum()
+        prob, alias = self._vose(weights)
+        self._prob[first:first + self.block_size] = prob
+        self._alias[first:first + self.block_size] = alias + first
+
+    def _build_top(self):
+        self._top_prob, self._top_alias = self._vose(self._block_totals)
+
+    @staticmethod
+    def _vose(weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Acceptance probabilities and aliases of one table, O(len(weights))"""
+        n = len(weights)
+        total = weights.sum()
+        if total <= 0:
+            # Empty block, never selected by the level above
+            return np.ones(n), np.arange(n)
+
+        scaled = (weights * (n / total)).tolist()
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, value in enumerate(scaled) if value < 1]
+        large = [i for i, value in enumerate(scaled) if value >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] += scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+        # Leftovers are 1 up to rounding
+        return np.array(prob), np.array(alias, dtype=np.int64)
+
+    @staticmethod
+    def _check(weights: np.ndarray):
+        if not np.isfinite(weights).all() or (weights < 0).any():
+            raise ValueError("weights must be finite and non-negative")
+        if weights.sum() <= 0:
+            raise ValueError("weights must not all be zero")
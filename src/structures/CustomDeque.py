@@ -1,30 +1,160 @@
-from collections import deque
 import random
+import numpy as np
+from typing import Iterable, Iterator, Optional
 
 class CustomDeque:
-    def __init__(self):
-        self.deque = deque()
+    """Ring buffer deque with O(1) access to any position"""
+
+    def __init__(self, capacity: int = 16, rng: Optional[random.Random] = None):
+        self.rng = rng if rng is not None else random.Random()
+        self._buffer = [None] * max(1, capacity)
+        self._head = 0
+        self._size = 0
+        self._shuffle_cursor = 0  # Next buffer slot of the running Fisher-Yates pass
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[int]:
+        for i in range(self._size):
+            yield self._buffer[(self._head + i) % len(self._buffer)]
+
+    def __getitem__(self, index: int) -> int:
+        return self._buffer[self._physical(index)]
+
+    def __setitem__(self, index: int, value: int):
+        self._buffer[self._physical(index)] = value
+
+    def _physical(self, index: int) -> int:
+        if index < 0:
+            index += self._size
+        if index < 0 or index >= self._size:
+            raise IndexError("Deque index out of range")
+        return (self._head + index) % len(self._buffer)
+
+    def _resize(self, capacity: int):
+        """Move contents to a buffer of the given capacity starting at slot 0"""
+        items = list(self)
+        self._buffer = items + [None] * (capacity - len(items))
+        self._head = 0
+        self._shuffle_cursor = 0
 
     def append(self, value: int):
-        self.deque.append(value)
+        if self._size == len(self._buffer):
+            self._resize(2 * len(self._buffer))
+        self._buffer[(self._head + self._size) % len(self._buffer)] = value
+        self._size += 1
+        self._shuffle_cursor = 0
 
     def appendleft(self, value: int):
-        self.deque.appendleft(value)
+        if self._size == len(self._buffer):
+            self._resize(2 * len(self._buffer))
+        self._head = (self._head - 1) % len(self._buffer)
+        self._buffer[self._head] = value
+        self._size += 1
+        self._shuffle_cursor = 0
+
+    def extend(self, values: Iterable[int]):
+        values = list(values)
+        if self._size + len(values) > len(self._buffer):
+            self._resize(self._size + len(values))
+
+        # Fill the free slots after the tail, wrapping to the buffer start once
+        tail = (self._head + self._size) % len(self._buffer)
+        first = min(len(values), len(self._buffer) - tail)
+        self._buffer[tail:tail + first] = values[:first]
+        self._buffer[:len(values) - first] = values[first:]
+        self._size += len(values)
+        self._shuffle_cursor = 0
 
     def pop(self) -> int:
-        return self.deque.pop()
+        if not self._size:
+            raise IndexError("pop from an empty deque")
+        value = self[-1]
+        self[-1] = None
+        self._size -= 1
+        self._shuffle_cursor = 0
+        return value
 
     def popleft(self) -> int:
-        return self.deque.popleft()
+        if not self._size:
+            raise IndexError("pop from an empty deque")
+        value = self[0]
+        self[0] = None
+        self._head = (self._head + 1) % len(self._buffer)
+        self._size -= 1
+        self._shuffle_cursor = 0
+        return value
 
     def get_middle(self) -> int:
         """Get an element from the middle section"""
-        mid = len(self.deque) // 2
-        return list(self.deque)[mid]
+        return self[self._size // 2]
+
+    def random_item(self) -> int:
+        """Get an element from a uniformly random position"""
+        return self[self.rng.randrange(self._size)]
+
+    def rotate(self, steps: int):
+        """Rotate left by steps, O(1) once the buffer is exactly full"""
+        if not self._size:
+            return
+        if self._size != len(self._buffer):
+            self._resize(self._size)
+        self._head = (self._head + steps) % self._size
 
     def shuffle(self):
         """Shuffle the deque contents"""
-        items = list(self.deque)
-        random.shuffle(items)
-        self.deque.clear()
-        self.deque.extend(items)
+        items = list(self)
+        self.rng.shuffle(items)
+        self._buffer = items + [None] * (len(self._buffer) - len(items))
+        self._head = 0
+        self._shuffle_cursor = 0
+
+    def shuffle_step(self, steps: int):
+        """Advance an incremental Fisher-Yates shuffle by at most `steps` swaps.
+
+        A pass runs over the buffer slots from last to first and restarts once
+        it reaches the first, so every len(deque) swaps produce a fresh
+        uniform permutation while each call does bounded work. Passes work on
+        buffer slots, so rotate() does not disturb a running pass.
+        """
+        if self._size < 2:
+            return
+        if self._size != len(self._buffer):
+            self._resize(self._size)
+
+        buffer = self._buffer
+        for _ in range(steps):
+            if self._shuffle_cursor < 1:
+                self._shuffle_cursor = self._size - 1
+            i = self._shuffle_cursor
+            j = self.rng.randint(0, i)
+            buffer[i], buffer[j] = buffer[j], buffer[i]
+            self._shuffle_cursor -= 1
+
+    def shuffle_slots(self, count: int, np_rng: np.random.Generator):
+        """Permute the contents of `count` uniformly chosen buffer slots among themselves.
+
+        Bulk counterpart of shuffle_step: the slot choice and permutation are
+        drawn with NumPy, so the cost is a few list operations per slot
+        rather than a random.Random call per swap. A running shuffle_step
+        pass is left where it is.
+        """
+        if self._size < 2:
+            return
+        if self._size != len(self._buffer):
+            self._resize(self._size)
+
+        count = min(count, self._size)
+        slots = np_rng.choice(self._size, count, replace=False)
+        sources = slots[np_rng.permutation(count)]
+        if count * 8 >= self._size:
+            # Large shares are cheaper as one round trip through an array
+            items = np.array(self._buffer, dtype=np.int64)
+            items[slots] = items[sources]
+            self._buffer = items.tolist()
+            return
+        buffer = self._buffer
+        values = [buffer[source] for source in sources.tolist()]
+        for slot, value in zip(slots.tolist(), values):
+            buffer[slot] = value
@@ -0,0 +1,113 @@
+import random
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+class HistoryBuffer:
+    """Fixed-capacity ring buffer of picks with an incrementally kept region histogram"""
+
+    def __init__(self, start: int, end: int, capacity: int = 1000, region_count: int = 10,
+                 rng: Optional[random.Random] = None):
+        if capacity < 1:
+            raise ValueError("history capacity must be at least 1")
+        self.rng = rng if rng is not None else random.Random()
+        self.start = start
+        self.end = end
+        self.capacity = capacity
+        # Never more regions than numbers, so every region is non-empty
+        self.region_count = max(1, min(region_count, end - start + 1))
+        self.region_size = max(1, (end - start + 1) // self.region_count)
+        self.region_counts = [0] * self.region_count
+
+        self._buffer = [0] * capacity
+        self._head = 0  # Slot of the oldest entry
+        self._size = 0
+
+        # Regions below the average count, with each region's slot in that list (-1 if absent)
+        self._sparse = []
+        self._sparse_slot = [-1] * self.region_count
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[int]:
+        for i in range(self._size):
+            yield self._buffer[(self._head + i) % self.capacity]
+
+    def to_list(self) -> List[int]:
+        return list(self)
+
+    def region_of(self, num: int) -> int:
+        return min(self.region_count - 1, (num - self.start) // self.region_size)
+
+    def region_bounds(self, region: int) -> Tuple[int, int]:
+        region_start = self.start + region * self.region_size
+        if region == self.region_count - 1:
+            return region_start, self.end
+        return region_start, region_start + self.region_size - 1
+
+    def append(self, num: int):
+        if self._size == self.capacity:
+            # Full window: the total stays constant, so only two regions can change status
+            evicted = self.region_of(self._buffer[self._head])
+            added = self.region_of(num)
+            self._buffer[self._head] = num
+            self._head = (self._head + 1) % self.capacity
+            self.region_counts[evicted] -= 1
+            self.region_counts[added] += 1
+            self._update_region(evicted)
+            self._update_region(added)
+        else:
+            # Filling up: the average moves, so every region is rechecked
+            self._buffer[(self._head + self._size) % self.capacity] = num
+            self._size += 1
+            self.region_counts[self.region_of(num)] += 1
+            self._update_all_regions()
+
+    def extend(self, numbers: Iterable[int]):
+        """Append many numbers, rechecking region status once at the end"""
+        for num in numbers:
+            region = self.region_of(num)
+            if self._size == self.capacity:
+                self.region_counts[self.region_of(self._buffer[self._head])] -= 1
+                self._buffer[self._head] = num
+                self._head = (self._head + 1) % self.capacity
+            else:
+                self._buffer[(self._head + self._size) % self.capacity] = num
+                self._size += 1
+            self.region_counts[region] += 1
+        self._update_all_regions()
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+        self.region_counts = [0] * self.region_count
+        self._update_all_regions()
+
+    def sparse_regions(self) -> List[Tuple[int, int]]:
+        """Bounds of regions with below-average counts (the whole range if none)"""
+        if not self._sparse:
+            return [(self.start, self.end)]
+        return [self.region_bounds(region) for region in self._sparse]
+
+    def random_sparse_region(self) -> Tuple[int, int]:
+        """Bounds of a uniformly chosen below-average region, in O(1)"""
+        if not self._sparse:
+            return self.start, self.end
+        return self.region_bounds(self.rng.choice(self._sparse))
+
+    def _update_all_regions(self):
+        for region in range(self.region_count):
+            self._update_region(region)
+
+    def _update_region(self, region: int):
+        # count < total / region_count, kept in integers
+        below = self.region_counts[region] * self.region_count < self._size
+        slot = self._sparse_slot[region]
+        if below and slot == -1:
+            self._sparse_slot[region] = len(self._sparse)
+            self._sparse.append(region)
+        elif not below and slot != -1:
+            last = self._sparse.pop()
+            if last != region:
+                self._sparse[slot] = last
+                self._sparse_slot[last] = slot
+            self._sparse_slot[region] = -1
@@ -1,6 +1,22 @@
+import heapq
+from typing import Iterable, List, Optional
+
 class MaxHeap:
-    def __init__(self):
+    def __init__(self, values: Optional[Iterable[int]] = None, presorted: bool = False):
         self.heap = []
+        if values is not None:
+            self.heapify(values, presorted)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def heapify(self, values: Iterable[int], presorted: bool = False):
+        """Replace the contents with values in O(n), or O(1) work per value if already descending"""
+        self.heap = list(values)
+        if presorted:
+            return
+        for index in range(len(self.heap) // 2 - 1, -1, -1):
+            self._sift_down(index)
 
     def insert(self, value: int):
         self.heap.append(value)
@@ -24,24 +40,46 @@ class MaxHeap:
 
         return max_val
 
-    def _sift_up(self, index: int):
-        parent = (index - 1) // 2
+    def peek_k(self, k: int) -> List[int]:
+        """Return the k largest values in descending order without removing them"""
+        result = []
+        frontier = [(-self.heap[0], 0)] if self.heap else []
+        while frontier and len(result) < k:
+            value, index = heapq.heappop(frontier)
+            result.append(-value)
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(self.heap):
+                    heapq.heappush(frontier, (-self.heap[child], child))
+        return result
 
-        if index > 0 and self.heap[index] > self.heap[parent]:
-            self.heap[index], self.heap[parent] = self.heap[parent], self.heap[index]
-            self._sift_up(parent)
+    def extract_k(self, k: int) -> List[int]:
+        """Remove and return the k largest values in descending order"""
+        return [self.extract_max() for _ in range(min(k, len(self.heap)))]
 
-    def _sift_down(self, index: int):
-        largest = index
-        left = 2 * index + 1
-        right = 2 * index + 2
-
-        if left < len(self.heap) and self.heap[left] > self.heap[largest]:
-            largest = left
-
-        if right < len(self.heap) and self.heap[right] > self.heap[largest]:
-            largest = right
+    def _sift_up(self, index: int):
+        heap = self.heap
+        value = heap[index]
+        while index > 0:
+            parent = (index - 1) // 2
+            if value <= heap[parent]:
+                break
+            heap[index] = heap[parent]
+            index = parent
+        heap[index] = value
 
-        if largest != index:
-            self.heap[index], self.heap[largest] = self.heap[largest], self.heap[index]
-            self._sift_down(largest)
+    def _sift_down(self, index: int):
+        heap = self.heap
+        size = len(heap)
+        value = heap[index]
+        while True:
+            largest = 2 * index + 1
+            if largest >= size:
+                break
+            right = largest + 1
+            if right < size and heap[right] > heap[largest]:
+                largest = right
+            if heap[largest] <= value:
+                break
+            heap[index] = heap[largest]
+            index = largest
+        heap[index] = value
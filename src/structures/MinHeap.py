@@ -1,6 +1,22 @@
+import heapq
+from typing import Iterable, List, Optional
+
 class MinHeap:
-    def __init__(self):
+    def __init__(self, values: Optional[Iterable[int]] = None, presorted: bool = False):
         self.heap = []
+        if values is not None:
+            self.heapify(values, presorted)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def heapify(self, values: Iterable[int], presorted: bool = False):
+        """Replace the contents with values in O(n), or O(1) work per value if already ascending"""
+        self.heap = list(values)
+        if presorted:
+            return
+        for index in range(len(self.heap) // 2 - 1, -1, -1):
+            self._sift_down(index)
 
     def insert(self, value: int):
         self.heap.append(value)
@@ -24,24 +40,46 @@ class MinHeap:
 
         return min_val
 
-    def _sift_up(self, index: int):
-        parent = (index - 1) // 2
+    def peek_k(self, k: int) -> List[int]:
+        """Return the k smallest values in ascending order without removing them"""
+        result = []
+        frontier = [(self.heap[0], 0)] if self.heap else []
+        while frontier and len(result) < k:
+            value, index = heapq.heappop(frontier)
+            result.append(value)
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(self.heap):
+                    heapq.heappush(frontier, (self.heap[child], child))
+        return result
 
-        if index > 0 and self.heap[index] < self.heap[parent]:
-            self.heap[index], self.heap[parent] = self.heap[parent], self.heap[index]
-            self._sift_up(parent)
+    def extract_k(self, k: int) -> List[int]:
+        """Remove and return the k smallest values in ascending order"""
+        return [self.extract_min() for _ in range(min(k, len(self.heap)))]
 
-    def _sift_down(self, index: int):
-        smallest = index
-        left = 2 * index + 1
-        right = 2 * index + 2
-
-        if left < len(self.heap) and self.heap[left] < self.heap[smallest]:
-            smallest = left
-
-        if right < len(self.heap) and self.heap[right] < self.heap[smallest]:
-            smallest = right
+    def _sift_up(self, index: int):
+        heap = self.heap
+        value = heap[index]
+        while index > 0:
+            parent = (index - 1) // 2
+            if value >= heap[parent]:
+                break
+            heap[index] = heap[parent]
+            index = parent
+        heap[index] = value
 
-        if smallest != index:
-            self.heap[index], self.heap[smallest] = self.heap[smallest], self.heap[index]
-            self._sift_down(smallest)
+    def _sift_down(self, index: int):
+        heap = self.heap
+        size = len(heap)
+        value = heap[index]
+        while True:
+            smallest = 2 * index + 1
+            if smallest >= size:
+                break
+            right = smallest + 1
+            if right < size and heap[right] < heap[smallest]:
+                smallest = right
+            if heap[smallest] >= value:
+                break
+            heap[index] = heap[smallest]
+            index = smallest
+        heap[index] = value
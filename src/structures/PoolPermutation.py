@@ -0,0 +1,117 @@
+import numpy as np
+from typing import Iterator, Optional
+from src.structures.SegmentedPool import SegmentedPool
+
+MASK64 = (1 << 64) - 1
+
+# Round function multipliers (SplitMix64 finalizer)
+_MUL1 = 0x9E3779B97F4A7C15
+_MUL2 = 0xBF58476D1CE4E5B9
+
+class PoolPermutation:
+    """Every available number of a pool exactly once, in keyed pseudorandom order.
+
+    Pool positions 0..count-1 are encrypted with a balanced Feistel network
+    over the smallest even-bit domain covering them; results outside the
+    pool are encrypted again (cycle-walking) until they land inside, which
+    keeps the mapping a permutation. Nothing but the round keys is stored,
+    so perm[i], index() and the resumable cursor are O(1) memory.
+    """
+
+    def __init__(self, pool: SegmentedPool, seed: Optional[int] = None, rounds: int = 6, position: int = 0):
+        self.pool = pool
+        self.count = pool.count()
+        self.rounds = rounds
+        # Entropy is drawn when no seed is given; keep it to recreate the same order
+        sequence = np.random.SeedSequence(seed)
+        self.seed = sequence.entropy
+        self.keys = [int(key) for key in sequence.generate_state(rounds, np.uint64)]
+        self.position = position  # Cursor of next()/next_chunk()
+
+        self._half_bits = max(1, ((self.count - 1).bit_length() + 1) // 2)
+        self._half_mask = (1 << self._half_bits) - 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> int:
+        if index < 0:
+            index += self.count
+        if index < 0 or index >= self.count:
+            raise IndexError("Permutation index out of range")
+        return self.pool.kth(self._walk(index, self._encrypt))
+
+    def index(self, num: int) -> int:
+        """Permutation index at which num appears"""
+        if num not in self.pool:
+            raise ValueError(f"{num} is not an available number")
+        return self._walk(self.pool.rank(num), self._decrypt)
+
+    def __iter__(self) -> Iterator[int]:
+        return self
+
+    def __next__(self) -> int:
+        if self.position >= self.count:
+            raise StopIteration
+        number = self[self.position]
+        self.position += 1
+        return number
+
+    def next_chunk(self, size: int) -> np.ndarray:
+        """Next up to size numbers from the cursor as an int64 array (empty once exhausted)"""
+        stop = min(self.count, self.position + size)
+        indices = np.arange(self.position, stop, dtype=np.uint64)
+        self.position = stop
+        return self.pool.kth_array(self.permute_array(indices).astype(np.int64))
+
+    def chunks(self, size: int = 65536) -> Iterator[np.ndarray]:
+        """Yield the rest of the permutation in arrays of at most size numbers"""
+        while self.position < self.count:
+            yield self.next_chunk(size)
+
+    def permute_array(self, indices: np.ndarray) -> np.ndarray:
+        """Permuted pool positions of an array of indices, vectorized"""
+        positions = self._encrypt_array(np.asarray(indices, dtype=np.uint64))
+        count = np.uint64(self.count)
+        outside = np.flatnonzero(positions >= count)
+        while len(outside):
+            positions[outside] = self._encrypt_array(positions[outside])
+            outside = outside[positions[outside] >= count]
+        return positions
+
+    def _walk(self, value: int, step) -> int:
+        value = step(value)
+        while value >= self.count:
+            value = step(value)
+        return value
+
+    def _round(self, value: int, key: int) -> int:
+        z = ((value + key) * _MUL1) & MASK64
+        z ^= z >> 32
+        z = (z * _MUL2) & MASK64
+        z ^= z >> 29
+        return z & self._half_mask
+
+    def _encrypt(self, value: int) -> int:
+        left, right = value >> self._half_bits, value & self._half_mask
+        for key in self.keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << self._half_bits) | right
+
+    def _decrypt(self, value: int) -> int:
+        left, right = value >> self._half_bits, value & self._half_mask
+        for key in reversed(self.keys):
+            left, right = right ^ self._round(left, key), left
+        return (left << self._half_bits) | right
+
+    def _encrypt_array(self, values: np.ndarray) -> np.ndarray:
+        # Same arithmetic as _encrypt, uint64 wraps at 64 bits
+        half_bits, half_mask = np.uint64(self._half_bits), np.uint64(self._half_mask)
+        left, right = values >> half_bits, values & half_mask
+        for key in self.keys:
+            z = (right + np.uint64(key)) * np.uint64(_MUL1)
+            z ^= z >> np.uint64(32)
+            z *= np.uint64(_MUL2)
+            z ^= z >> np.uint64(29)
+            left, right = right, left ^ (z & half_mask)
+        return (left << half_bits) | right
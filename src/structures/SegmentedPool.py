@@ -1,16 +1,42 @@
 import random
-from typing import List, Set
+import numpy as np
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+INT64_MAX = 2**63 - 1
 
 class SegmentedPool:
-    def __init__(self, start: int, end: int, segment_count: int):
+    # How _create_gaps draws the excluded numbers of each segment
+    GAP_METHODS = ('sample', 'rejection')
+
+    def __init__(self, start: int, end: int, segment_count: int, max_gaps: Optional[int] = None,
+                 rng: Optional[random.Random] = None, excluded: Optional[Iterable[int]] = None,
+                 gap_fraction: float = 0.1, gap_method: str = 'sample', workers: int = 1):
+        if end - start + 1 > INT64_MAX:
+            raise ValueError("a pool cannot span more than 2^63 - 1 numbers")
+        if not 0 <= gap_fraction < 1:
+            raise ValueError("gap_fraction must be in [0, 1)")
+        if gap_method not in self.GAP_METHODS:
+            raise ValueError(f"gap_method must be one of {self.GAP_METHODS}")
+        self.rng = rng if rng is not None else random.Random()
         self.start = start
         self.end = end
         self.segment_count = segment_count
+        self.max_gaps = max_gaps  # Per-segment cap on excluded numbers (None = gap_fraction of it)
+        self.gap_fraction = gap_fraction
+        self.gap_method = gap_method
+        self.workers = workers  # Threads sampling segments in parallel
         self.segments = []
-        self.excluded_numbers = set()
+        self.excluded_numbers = []  # Sorted list of numbers removed by gaps
+        self._available_before = []  # Available numbers below each excluded number
 
         self._create_segments()
-        self._create_gaps()
+        if excluded is None:
+            self._create_gaps()
+        else:
+            # Known gap layout, e.g. from a snapshot: no random draws
+            self._set_excluded(np.asarray(excluded, dtype=np.int64))
 
     def _create_segments(self):
         range_size = self.end - self.start + 1
@@ -24,24 +50,110 @@ class SegmentedPool:
 
             self.segments.append((segment_start, segment_end))
 
+    def _gap_size(self, segment_size: int) -> int:
+        gap_size = int(segment_size * self.gap_fraction)
+        if self.max_gaps is not None:
+            gap_size = min(gap_size, self.max_gaps)
+        return gap_size
+
     def _create_gaps(self):
         """Create random gaps in each segment"""
-        for start, end in self.segments:
-            segment_size = end - start + 1
-            gap_size = segment_size // 10  # Remove ~10% of numbers
+        if self.gap_method == 'rejection':
+            self._create_gaps_by_rejection()
+            return
+
+        # Every segment samples from its own generator seeded here, so the
+        # layout does not depend on how many threads do the sampling
+        jobs = [(start, end - start + 1, self._gap_size(end - start + 1), self.rng.getrandbits(128))
+                for start, end in self.segments]
+        if self.workers > 1 and len(jobs) > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                gaps = list(executor.map(self._sample_segment_gaps, *zip(*jobs)))
+        else:
+            gaps = [self._sample_segment_gaps(*job) for job in jobs]
 
-            for _ in range(gap_size):
+        # Segments are disjoint and ascending, so the sorted parts concatenate sorted
+        self._set_excluded(np.concatenate(gaps) if gaps else np.empty(0, dtype=np.int64))
+
+    @staticmethod
+    def _sample_segment_gaps(start: int, segment_size: int, gap_size: int, seed: int) -> np.ndarray:
+        """gap_size distinct numbers of the segment, ascending"""
+        rng = np.random.default_rng(seed)
+        if 2 * gap_size > segment_size:
+            # Most of the segment goes, a permutation costs no more than the result
+            offsets = rng.choice(segment_size, gap_size, replace=False, shuffle=False)
+            offsets.sort()
+        else:
+            # The distinct values of uniform draws are a uniform subset of their
+            # size; dropping a random surplus keeps it uniform. O(gap_size) memory
+            # however large the segment is
+            offsets = np.empty(0, dtype=np.int64)
+            while len(offsets) < gap_size:
+                needed = gap_size - len(offsets)
+                offsets = np.concatenate([offsets, rng.integers(0, segment_size, needed + needed // 8 + 16)])
+                offsets.sort()
+                offsets = offsets[np.concatenate(([True], offsets[1:] != offsets[:-1]))]
+            surplus = len(offsets) - gap_size
+            if surplus:
+                offsets = np.delete(offsets, rng.choice(len(offsets), surplus, replace=False))
+        return offsets.astype(np.int64) + start
+
+    def _create_gaps_by_rejection(self):
+        """Original gap generation: one randint per excluded number, retried on repeats"""
+        excluded = set()
+        for start, end in self.segments:
+            for _ in range(self._gap_size(end - start + 1)):
                 while True:
-                    num = random.randint(start, end)
-                    if num not in self.excluded_numbers:
-                        self.excluded_numbers.add(num)
+                    num = self.rng.randint(start, end)
+                    if num not in excluded:
+                        excluded.add(num)
                         break
 
+        self._set_excluded(np.array(sorted(excluded), dtype=np.int64))
+
+    def _set_excluded(self, excluded: np.ndarray):
+        """Install an ascending array of excluded numbers and its rank table"""
+        self.excluded_numbers = excluded.tolist()
+        self._available_before_array = excluded - self.start - np.arange(len(excluded), dtype=np.int64)
+        self._available_before = self._available_before_array.tolist()
+
+    def count(self) -> int:
+        """Number of available (non-excluded) numbers"""
+        return self.end - self.start + 1 - len(self.excluded_numbers)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __contains__(self, num: int) -> bool:
+        if num < self.start or num > self.end:
+            return False
+        i = bisect_left(self.excluded_numbers, num)
+        return i == len(self.excluded_numbers) or self.excluded_numbers[i] != num
+
+    def kth(self, k: int) -> int:
+        """Return the k-th available number (0-based, negative k counts from the end)"""
+        count = self.count()
+        if k < 0:
+            k += count
+        if k < 0 or k >= count:
+            raise IndexError("Pool index out of range")
+
+        # Every excluded number with fewer than k+1 available numbers below it shifts k by one
+        skipped = bisect_right(self._available_before, k)
+        return self.start + k + skipped
+
+    def kth_array(self, ks: np.ndarray) -> np.ndarray:
+        """Vectorized kth for an array of non-negative positions"""
+        ks = np.asarray(ks, dtype=np.int64)
+        skipped = np.searchsorted(self._available_before_array, ks, side='right')
+        return self.start + ks + skipped
+
+    def rank(self, num: int) -> int:
+        """Return the number of available numbers strictly below num"""
+        num = min(max(num, self.start), self.end + 1)
+        return num - self.start - bisect_left(self.excluded_numbers, num)
+
     def get_all_numbers(self) -> List[int]:
         """Return all numbers that aren't in gaps"""
-        numbers = []
-        for start, end in self.segments:
-            for num in range(start, end + 1):
-                if num not in self.excluded_numbers:
-                    numbers.append(num)
-        return numbers
+        numbers = np.arange(self.start, self.end + 1, dtype=np.int64)
+        return np.delete(numbers, np.asarray(self.excluded_numbers, dtype=np.int64) - self.start).tolist()
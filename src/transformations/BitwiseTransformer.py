@@ -1,6 +1,16 @@
 import random
+import numpy as np
+from typing import Optional
+
+MASK64 = (1 << 64) - 1
+
+# Bit-reversed value of every byte, used for table-driven bit reversal
+_REVERSED_BYTES = np.array([int(f'{b:08b}'[::-1], 2) for b in range(256)], dtype=np.uint8)
 
 class BitwiseTransformer:
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng if rng is not None else random.Random()
+
     def transform(self, number: int) -> int:
         operations = [
             self._xor_transform,
@@ -13,34 +23,72 @@ class BitwiseTransformer:
         ]
 
         # Apply 2-5 random transformations
-        for _ in range(random.randint(2, 5)):
-            operation = random.choice(operations)
+        number &= MASK64
+        for _ in range(self.rng.randint(2, 5)):
+            operation = self.rng.choice(operations)
             number = operation(number)
 
         return number
 
+    def transform_batch(self, numbers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Apply transform() to every element of a uint64 array.
+
+        Each element gets its own 2-5 random operations. Every round, the
+        elements still active are grouped by their chosen operation and each
+        group runs through a vectorized kernel with per-element parameters.
+        """
+        kernels = [
+            self._xor_batch,
+            self._shift_batch,
+            self._and_batch,
+            self._or_batch,
+            self._rotate_batch,
+            self._swap_bits_batch,
+            self._reverse_bits_batch
+        ]
+
+        numbers = np.array(numbers, dtype=np.uint64)
+        rounds = rng.integers(2, 6, len(numbers))
+        for round_index in range(5):
+            active = np.flatnonzero(rounds > round_index)
+            if not active.size:
+                break
+            operations = rng.integers(0, len(kernels), active.size)
+            for operation, kernel in enumerate(kernels):
+                selected = active[operations == operation]
+                if selected.size:
+                    numbers[selected] = kernel(numbers[selected], rng)
+
+        return numbers
+
+    @staticmethod
+    def reverse_bits_batch(numbers: np.ndarray) -> np.ndarray:
+        """Reverse all 64 bits of every element using byte-table lookups"""
+        numbers = np.ascontiguousarray(numbers, dtype=np.uint64)
+        return _REVERSED_BYTES[numbers.view(np.uint8)].view(np.uint64).byteswap()
+
     def _xor_transform(self, number: int) -> int:
-        return number ^ random.getrandbits(64)
+        return number ^ self.rng.getrandbits(64)
 
     def _shift_transform(self, number: int) -> int:
-        shift = random.randint(1, 8)
-        direction = random.choice(['left', 'right'])
-        return (number << shift) if direction == 'left' else (number >> shift)
+        shift = self.rng.randint(1, 8)
+        direction = self.rng.choice(['left', 'right'])
+        return ((number << shift) & MASK64) if direction == 'left' else (number >> shift)
 
     def _and_transform(self, number: int) -> int:
-        return number & random.getrandbits(64)
+        return number & self.rng.getrandbits(64)
 
     def _or_transform(self, number: int) -> int:
-        return number | random.getrandbits(32)
+        return number | self.rng.getrandbits(32)
 
     def _rotate_transform(self, number: int) -> int:
         bits = 64
-        rotation = random.randint(1, 63)
+        rotation = self.rng.randint(1, 63)
         return ((number << rotation) | (number >> (bits - rotation))) & ((1 << bits) - 1)
 
     def _swap_bits_transform(self, number: int) -> int:
-        pos1 = random.randint(0, 31)
-        pos2 = random.randint(0, 31)
+        pos1 = self.rng.randint(0, 31)
+        pos2 = self.rng.randint(0, 31)
         bit1 = (number >> pos1) & 1
         bit2 = (number >> pos2) & 1
         x = (bit1 ^ bit2)
@@ -53,3 +101,38 @@ class BitwiseTransformer:
             result = (result << 1) | (number & 1)
             number >>= 1
         return result
+
+    # Vectorized counterparts of the operations above, on uint64 arrays
+
+    def _random_words(self, rng: np.random.Generator, size: int, bits: int = 64) -> np.ndarray:
+        return rng.integers(0, (1 << bits) - 1, size, dtype=np.uint64, endpoint=True)
+
+    def _xor_batch(self, numbers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        return numbers ^ self._random_words(rng, len(numbers))
+
+    def _shift_batch(self, numbers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        shifts = rng.integers(1, 9, len(numbers)).astype(np.uint64)
+        left = rng.random(len(numbers)) < 0.5
+        # uint64 shifts wrap at 64 bits, matching the masked scalar shift
+        return np.where(left, numbers << shifts, numbers >> shifts)
+
+    def _and_batch(self, numbers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        return numbers & self._random_words(rng, len(numbers))
+
+    def _or_batch(self, numbers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        return numbers | self._random_words(rng, len(numbers), 32)
+
+    def _rotate_batch(self, numbers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        rotations = rng.integers(1, 64, len(numbers)).astype(np.uint64)
+        return (numbers << rotations) | (numbers >> (np.uint64(64) - rotations))
+
+    def _swap_bits_batch(self, numbers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        pos1 = rng.integers(0, 32, len(numbers)).astype(np.uint64)
+        pos2 = rng.integers(0, 32, len(numbers)).astype(np.uint64)
+        one = np.uint64(1)
+        x = ((numbers >> pos1) & one) ^ ((numbers >> pos2) & one)
+        return numbers ^ ((x << pos1) | (x << pos2))
+
+    def _reverse_bits_batch(self, numbers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        # Reversing all 64 bits moves the low 32 bits, reversed, into the high half
+        return self.reverse_bits_batch(numbers) >> np.uint64(32)
@@ -1,12 +1,18 @@
 import hashlib
 import struct
 import random
-import hmac
+import numpy as np
+from typing import List, Optional
+
+# Fixed-width big-endian packing of batch inputs
+_PACK_U64 = struct.Struct('>Q').pack
 
 class HashingTransformer:
-    def __init__(self):
-        self.salt = random.randbytes(16)
-        self.keys = [random.randbytes(32) for _ in range(5)]
+    def __init__(self, rng: Optional[random.Random] = None, salt: Optional[bytes] = None, keys: Optional[List[bytes]] = None):
+        self.rng = rng if rng is not None else random.Random()
+        # Drawn from rng unless given, e.g. when restoring a snapshot
+        self.salt = salt if salt is not None else self.rng.randbytes(16)
+        self.keys = keys if keys is not None else [self.rng.randbytes(32) for _ in range(5)]
         self.algorithms = [
             hashlib.sha256,
             hashlib.sha512,
@@ -15,12 +21,16 @@ class HashingTransformer:
             hashlib.sha3_512
         ]
 
+        # Pre-salted and pre-keyed states, copied instead of rebuilt per hash
+        self._salted_states = [algorithm(self.salt) for algorithm in self.algorithms]
+        self._keyed_states = [self._hmac_states(key) for key in self.keys]
+
     def transform(self, number: int) -> int:
         # Multi-layer hashing
         result = number
 
         # Apply multiple rounds of hashing
-        for _ in range(random.randint(2, 4)):
+        for _ in range(self.rng.randint(2, 4)):
             result = self._single_hash_round(result)
 
         # Apply HMAC with random key
@@ -31,9 +41,53 @@ class HashingTransformer:
 
         return result
 
+    def transform_batch(self, numbers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Hash a uint64 array with the same round structure as transform().
+
+        Inputs are packed as 8 big-endian bytes behind the salt (the scalar
+        path hashes the decimal string followed by the salt), and every hash
+        starts from a copy of a pre-salted or pre-keyed state. All random
+        choices are drawn up front with NumPy.
+        """
+        n = len(numbers)
+        round_counts = rng.integers(2, 5, n).tolist()
+        algorithm_ids = rng.integers(0, len(self.algorithms), (n, 4)).tolist()
+        key_ids = rng.integers(0, len(self.keys), n).tolist()
+        values = np.asarray(numbers, dtype=np.uint64).tolist()
+
+        hashed = self._hash_chunk(values, round_counts, algorithm_ids, key_ids)
+        return self._mix_bits_batch(np.array(hashed, dtype=np.uint64))
+
+    def _hash_chunk(self, values: List[int], round_counts: List[int],
+                    algorithm_ids: List[List[int]], key_ids: List[int]) -> List[int]:
+        salted_states = self._salted_states
+        keyed_states = self._keyed_states
+        from_bytes = int.from_bytes
+        hashed = []
+        for value, rounds, algorithms, key_id in zip(values, round_counts, algorithm_ids, key_ids):
+            for algorithm_id in algorithms[:rounds]:
+                h = salted_states[algorithm_id].copy()
+                h.update(_PACK_U64(value))
+                value = from_bytes(h.digest()[:8], 'big')
+            inner, outer = keyed_states[key_id]
+            h = inner.copy()
+            h.update(_PACK_U64(value))
+            digest = h.digest()
+            h = outer.copy()
+            h.update(digest)
+            hashed.append(from_bytes(h.digest()[:8], 'big'))
+        return hashed
+
+    def _hmac_states(self, key: bytes):
+        """Inner and outer HMAC-SHA512 states already fed with the padded key"""
+        block = key.ljust(hashlib.sha512().block_size, b'\0')
+        inner = hashlib.sha512(bytes(b ^ 0x36 for b in block))
+        outer = hashlib.sha512(bytes(b ^ 0x5c for b in block))
+        return inner, outer
+
     def _single_hash_round(self, number: int) -> int:
         # Choose random algorithm
-        algorithm = random.choice(self.algorithms)
+        algorithm = self.rng.choice(self.algorithms)
 
         # Add salt to the input
         input_data = str(number).encode() + self.salt
@@ -45,8 +99,13 @@ class HashingTransformer:
         return int.from_bytes(hashed[:8], byteorder='big')
 
     def _hmac_round(self, number: int) -> int:
-        key = random.choice(self.keys)
-        h = hmac.new(key, str(number).encode(), hashlib.sha512)
+        # HMAC-SHA512 with a random key, from the pre-keyed states
+        inner, outer = self.rng.choice(self._keyed_states)
+        h = inner.copy()
+        h.update(str(number).encode())
+        digest = h.digest()
+        h = outer.copy()
+        h.update(digest)
         return int.from_bytes(h.digest()[:8], byteorder='big')
 
     def _mix_bits(self, number: int) -> int:
@@ -55,3 +114,10 @@ class HashingTransformer:
         number = ((number >> 7) ^ number) & ((1 << 64) - 1)
         number = ((number << 17) ^ number) & ((1 << 64) - 1)
         return number
+
+    def _mix_bits_batch(self, numbers: np.ndarray) -> np.ndarray:
+        # Same mixing as _mix_bits, uint64 arithmetic wraps at 64 bits
+        numbers = (numbers << np.uint64(13)) ^ numbers
+        numbers = (numbers >> np.uint64(7)) ^ numbers
+        numbers = (numbers << np.uint64(17)) ^ numbers
+        return numbers
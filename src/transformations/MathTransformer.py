@@ -1,9 +1,14 @@
 import random
 import math
-from typing import List
+import numpy as np
+from typing import List, Optional
 
 class MathTransformer:
-    def __init__(self):
+    # Largest float64 result below 2**64, batch results are clamped to it
+    MAX_RESULT = float(np.nextafter(2.0 ** 64, 0))
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng if rng is not None else random.Random()
         self.primes = [17, 31, 61, 89, 107, 127, 521, 607, 1279, 2203, 3571, 4909]
         # Calculate golden ratio (phi) = (1 + sqrt(5))/2
         golden_ratio = (1 + math.sqrt(5)) / 2
@@ -25,11 +30,27 @@ class MathTransformer:
         number = self._constant_transform(number)
         return abs(int(number))
 
+    def transform_batch(self, numbers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Apply transform() to every element of a uint64 array.
+
+        Every random choice is made per element. Overflow is handled with
+        np.errstate and explicit fallbacks/clamping instead of exceptions,
+        and results are non-negative integers like the scalar path.
+        """
+        values = self._prime_transform_batch(np.asarray(numbers, dtype=np.uint64), rng)
+        with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+            values = self._trigonometric_transform_batch(values.astype(np.float64), rng)
+            values = self._exponential_transform_batch(values, rng)
+            values = self._logarithmic_transform_batch(values, rng)
+            values = self._constant_transform_batch(values, rng)
+        values = np.clip(np.trunc(np.abs(values)), 0, self.MAX_RESULT)
+        return values.astype(np.uint64)
+
     def _prime_transform(self, number: int) -> float:
         # Apply modulus operations with multiple random primes
-        for _ in range(random.randint(2, 4)):
-            prime1 = random.choice(self.primes)
-            prime2 = random.choice(self.primes)
+        for _ in range(self.rng.randint(2, 4)):
+            prime1 = self.rng.choice(self.primes)
+            prime2 = self.rng.choice(self.primes)
             number = (number % prime1) * (number % prime2)
         return number
 
@@ -42,12 +63,12 @@ class MathTransformer:
             lambda x: math.sinh(x % 2) * 300,
             lambda x: math.cosh(x % 2) * 300
         ]
-        return random.choice(operations)(number)
+        return self.rng.choice(operations)(number)
 
     def _exponential_transform(self, number: float) -> float:
         # Apply exponential and root transformations
-        base = random.uniform(1.1, 2.0)
-        power = random.uniform(0.1, 3.0)
+        base = self.rng.uniform(1.1, 2.0)
+        power = self.rng.uniform(0.1, 3.0)
         try:
             return pow(abs(number * base), power)
         except OverflowError:
@@ -58,13 +79,13 @@ class MathTransformer:
         if number <= 0:
             number = 1
         try:
-            return math.log(number, random.uniform(2, 10)) * 1000
+            return math.log(number, self.rng.uniform(2, 10)) * 1000
         except ValueError:
-            return math.log(abs(number) + 1, random.uniform(2, 10)) * 1000
+            return math.log(abs(number) + 1, self.rng.uniform(2, 10)) * 1000
 
     def _constant_transform(self, number: float) -> float:
         # Mix with mathematical constants
-        constant = random.choice(self.constants)
+        constant = self.rng.choice(self.constants)
         operations = [
             lambda x, c: x * c,
             lambda x, c: x + c,
@@ -73,7 +94,67 @@ class MathTransformer:
             lambda x, c: (x * c) % (c * 1000)
         ]
         try:
-            return random.choice(operations)(number, constant)
+            return self.rng.choice(operations)(number, constant)
         except OverflowError:
             # If overflow occurs, use modulo to bring number into manageable range
-            return random.choice(operations)(number % 1000, constant)
+            return self.rng.choice(operations)(number % 1000, constant)
+
+    # Vectorized counterparts of the stages above
+
+    def _prime_transform_batch(self, numbers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        primes = np.array(self.primes, dtype=np.uint64)
+        rounds = rng.integers(2, 5, len(numbers))
+        for round_index in range(4):
+            active = rounds > round_index
+            prime1 = primes[rng.integers(0, len(primes), len(numbers))]
+            prime2 = primes[rng.integers(0, len(primes), len(numbers))]
+            # Both residues are below 4909, so the product cannot overflow
+            numbers = np.where(active, (numbers % prime1) * (numbers % prime2), numbers)
+        return numbers
+
+    def _trigonometric_transform_batch(self, numbers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        operations = [
+            lambda x: np.sin(x) * 1000,
+            lambda x: np.cos(x) * 1000,
+            lambda x: np.tan(np.mod(x, math.pi / 2)) * 500,
+            lambda x: np.sinh(np.mod(x, 2)) * 300,
+            lambda x: np.cosh(np.mod(x, 2)) * 300
+        ]
+        choice = rng.integers(0, len(operations), len(numbers))
+        result = np.empty_like(numbers)
+        for index, operation in enumerate(operations):
+            selected = choice == index
+            result[selected] = operation(numbers[selected])
+        return result
+
+    def _exponential_transform_batch(self, numbers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        base = rng.uniform(1.1, 2.0, len(numbers))
+        power = rng.uniform(0.1, 3.0, len(numbers))
+        result = np.power(np.abs(numbers * base), power)
+        # Where the scalar path would raise OverflowError, it retries on number % 100
+        overflow = ~np.isfinite(result)
+        fallback = np.power(np.abs(np.mod(numbers[overflow], 100) * base[overflow]), power[overflow])
+        result[overflow] = fallback
+        return result
+
+    def _logarithmic_transform_batch(self, numbers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        base = rng.uniform(2, 10, len(numbers))
+        numbers = np.where(numbers <= 0, 1.0, numbers)
+        return np.log(numbers) / np.log(base) * 1000
+
+    def _constant_transform_batch(self, numbers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        constants = np.array(self.constants)[rng.integers(0, len(self.constants), len(numbers))]
+        operations = [
+            lambda x, c: x * c,
+            lambda x, c: x + c,
+            lambda x, c: x * c + c,
+            lambda x, c: (x + c) * c,
+            lambda x, c: np.mod(x * c, c * 1000)
+        ]
+        choice = rng.integers(0, len(operations), len(numbers))
+        result = np.empty_like(numbers)
+        for index, operation in enumerate(operations):
+            selected = choice == index
+            result[selected] = operation(numbers[selected], constants[selected])
+        # Inputs are bounded by the log stage, clamp anyway so no op can overflow the cast
+        return np.clip(result, -self.MAX_RESULT, self.MAX_RESULT)
@@ -0,0 +1,14 @@
+from src.structures.MinHeap import MinHeap
+from src.structures.MaxHeap import MaxHeap
+
+def test_max_heap_k_largest_descending():
+    heap = MaxHeap([5, 1, 9, 3, 7])
+    assert heap.peek_k(3) == [9, 7, 5]
+    assert heap.extract_k(3) == [9, 7, 5]
+    assert heap.extract_k(5) == [3, 1]
+
+def test_min_heap_k_smallest_ascending():
+    heap = MinHeap([5, 1, 9, 3, 7])
+    assert heap.peek_k(3) == [1, 3, 5]
+    assert heap.extract_k(3) == [1, 3, 5]
+    assert heap.extract_k(5) == [7, 9]
@@ -0,0 +1,15 @@
+import pytest
+from src.RandomPicker import RandomPicker
+from src.structures.HistoryBuffer import HistoryBuffer
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        HistoryBuffer(1, 100, capacity=0)
+    with pytest.raises(ValueError):
+        RandomPicker(1, 100, history_size=0)
+
+def test_keeps_the_last_capacity_numbers():
+    history = HistoryBuffer(1, 100, capacity=3)
+    history.extend([5, 6, 7])
+    history.append(8)
+    assert history.to_list() == [6, 7, 8]
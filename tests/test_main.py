@@ -0,0 +1,27 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def run_main(*args):
+    return subprocess.run([sys.executable, 'main.py', *args], cwd=ROOT, capture_output=True, text=True)
+
+def test_generate_failure_exits_non_zero_without_output(tmp_path):
+    output = tmp_path / 'numbers.bin'
+    result = run_main('generate', '--start', '5', '--end', '1', '--count', '10', '--output', str(output))
+    assert result.returncode == 1
+    assert 'An error occurred' in result.stderr
+    assert result.stdout == ''
+    assert not output.exists()
+
+def test_test_failure_exits_non_zero():
+    result = run_main('test', '--start', '5', '--end', '1', '--count', '10')
+    assert result.returncode == 1
+    assert 'An error occurred' in result.stderr
+
+def test_generate_writes_count_words(tmp_path):
+    output = tmp_path / 'numbers.bin'
+    result = run_main('generate', '--start', '1', '--end', '100', '--count', '10', '--output', str(output))
+    assert result.returncode == 0
+    assert output.stat().st_size == 10 * 8
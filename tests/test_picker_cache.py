@@ -0,0 +1,26 @@
+import random
+from src.PickerCache import PickerCache
+from src.MultiRangeEngine import MultiRangeEngine
+from src.RandomPicker import RandomPicker
+
+def test_pool_does_not_build_heaps(monkeypatch):
+    built = []
+    create_heaps = RandomPicker.create_heaps
+    monkeypatch.setattr(RandomPicker, 'create_heaps', classmethod(lambda cls, pool: built.append(pool) or create_heaps(pool)))
+
+    cache = PickerCache()
+    engine = MultiRangeEngine(rng=random.Random(0), pool_cache=cache)
+    engine.register(1, 10**5, seed=7)
+    pool = cache.pool(1, 10**5, seed=7)
+    assert built == []
+    pool_only_bytes = cache.stats()['bytes']
+
+    # The first get() adds heaps over the same pool, later ones reuse them
+    first = cache.get(1, 10**5, seed=7)
+    second = cache.get(1, 10**5, seed=7)
+    assert built == [pool]
+    assert first.segmented_pool is pool and second.segmented_pool is pool
+    assert first.min_heap is second.min_heap
+    assert cache.stats()['entries'] == 1
+    assert cache.stats()['bytes'] == pool_only_bytes + pool.count() * PickerCache.BYTES_PER_NUMBER
+    assert first.pick() in pool
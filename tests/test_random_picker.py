@@ -0,0 +1,39 @@
+import random
+import pytest
+from src.RandomPicker import RandomPicker
+from src.analysis.QualityBattery import QualityBattery
+
+def runs_statistic(numbers, start, end):
+    battery = QualityBattery(start, end)
+    battery.update(numbers)
+    return battery.results()['runs']['statistic']
+
+def test_pick_many_runs_statistic_matches_pick():
+    # A short history makes Strategy 4 react quickly, so drawing it from
+    # stale history (as pick_many once did) shifts the runs z-score by ~5
+    differences = []
+    for seed in (0, 1):
+        scalar = RandomPicker(1, 100, history_size=20, rng=random.Random(seed))
+        batch = RandomPicker(1, 100, history_size=20, rng=random.Random(seed))
+        differences.append(runs_statistic(batch.pick_many(25_000), 1, 100) -
+                           runs_statistic([scalar.pick() for _ in range(25_000)], 1, 100))
+    assert abs(sum(differences) / len(differences)) < 2.5
+
+def test_pick_many_stays_in_range_and_feeds_history():
+    picker = RandomPicker(1, 100, history_size=50, rng=random.Random(2))
+    numbers = picker.pick_many(1000)
+    assert numbers.min() >= 1 and numbers.max() <= 100
+    assert picker.history.to_list() == numbers[-50:].tolist()
+
+def test_pmf_weights_cannot_select_excluded_numbers():
+    picker = RandomPicker(1, 100, rng=random.Random(0))
+    excluded = picker.segmented_pool.excluded_numbers
+    with pytest.raises(ValueError):
+        picker.set_weights(pmf=[1.0] * picker.range)
+
+    weights = [0.0 if number in excluded else 1.0 for number in range(1, 101)]
+    picker.set_weights(pmf=weights)
+    with pytest.raises(ValueError):
+        picker.update_weights([excluded[0] - 1], [2.0])
+    picker.update_weights([excluded[0] - 1], [0.0])
+    assert not set(picker.pick_weighted_many(2000).tolist()) & set(excluded)
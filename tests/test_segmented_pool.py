@@ -0,0 +1,51 @@
+import random
+import numpy as np
+import pytest
+from src.RandomPicker import RandomPicker
+from src.structures.SegmentedPool import SegmentedPool, INT64_MAX
+
+INT64_MIN = -2**63
+
+def check_consistent(pool: SegmentedPool, ks):
+    """kth, kth_array, rank and `in` agree on the given positions and every excluded number"""
+    numbers = [pool.kth(k) for k in ks]
+    assert pool.kth_array(np.array(ks, dtype=np.int64)).tolist() == numbers
+    for k, number in zip(ks, numbers):
+        assert pool.start <= number <= pool.end
+        assert number in pool
+        assert pool.rank(number) == k
+    for number in pool.excluded_numbers:
+        assert number not in pool
+        assert pool.rank(number + 1) == pool.rank(number)
+
+def test_small_pool_is_consistent_everywhere():
+    pool = SegmentedPool(-50, 149, 5, rng=random.Random(0), gap_fraction=0.3)
+    assert pool.get_all_numbers() == [pool.kth(k) for k in range(pool.count())]
+    check_consistent(pool, list(range(pool.count())))
+
+@pytest.mark.parametrize('start, end', [
+    (INT64_MIN, INT64_MIN + INT64_MAX - 1),
+    (INT64_MAX - INT64_MAX + 1, INT64_MAX),
+    (-2**62, 2**62 - 2),
+])
+def test_extreme_bounds_are_consistent(start, end):
+    pool = SegmentedPool(start, end, 5, max_gaps=1000, rng=random.Random(1))
+    count = pool.count()
+    assert count == end - start + 1 - 5000
+    rng = random.Random(2)
+    ks = [0, 1, count // 2, count - 2, count - 1] + [rng.randrange(count) for _ in range(200)]
+    # Positions right around the gaps
+    ks += [min(pool.rank(number), count - 1) for number in pool.excluded_numbers[::50]]
+    check_consistent(pool, ks)
+
+def test_spans_beyond_int64_are_rejected():
+    with pytest.raises(ValueError):
+        SegmentedPool(INT64_MIN, INT64_MAX, 5, max_gaps=10)
+    with pytest.raises(ValueError):
+        RandomPicker(INT64_MIN, INT64_MAX)
+
+def test_widest_picker_draws_in_range():
+    start, end = INT64_MIN, INT64_MIN + INT64_MAX - 1
+    picker = RandomPicker(start, end, rng=random.Random(3))
+    numbers = picker.pick_many(50)
+    assert all(start <= number <= end and number in picker.segmented_pool for number in numbers.tolist())
@@ -0,0 +1,105 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from src import NumGenServer as server_module
+from src.NumGenServer import NumGenServer, RangeBatcher
+from src.RandomPicker import RandomPicker
+
+async def tcp_exchange(server: NumGenServer, lines):
+    reader, writer = await asyncio.open_connection(server.host, server.tcp_port)
+    replies = []
+    for line in lines:
+        writer.write(line + b'\n')
+        await writer.drain()
+        replies.append((await reader.readline()).decode().strip())
+    writer.close()
+    await writer.wait_closed()
+    return replies
+
+async def http_get(server: NumGenServer, target: bytes):
+    reader, writer = await asyncio.open_connection(server.host, server.http_port)
+    writer.write(b'GET ' + target + b' HTTP/1.1\r\nHost: localhost\r\n\r\n')
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    head, body = response.split(b'\r\n\r\n', 1)
+    return head.split(b'\r\n')[0].decode().split(' ', 1)[1], json.loads(body)
+
+def run_with_server(scenario):
+    async def main():
+        server = NumGenServer(tcp_port=0, http_port=0, batch_window=0.001)
+        await server.start()
+        try:
+            return await scenario(server)
+        finally:
+            await server.stop()
+    return asyncio.run(main())
+
+def test_tcp_round_trip_and_errors():
+    replies = run_with_server(lambda server: tcp_exchange(server, [
+        b'PICK 1 100',
+        b'PICK_MANY 1 100 5',
+        b'PICK 1 1000000000000000000000',
+        b'\xff\xfe PICK',
+        b'PICK 5 1',
+        b'HELLO',
+        b'PICK -9223372036854775808 9223372036854775807',
+        b'PICK 1 100'
+    ]))
+    assert 1 <= int(replies[0]) <= 100
+    assert len(replies[1].split()) == 5
+    assert all(1 <= int(number) <= 100 for number in replies[1].split())
+    assert all(reply.startswith('ERR') for reply in replies[2:7])
+    assert 'OverflowError' not in replies[6]
+    # The connection survives every error
+    assert 1 <= int(replies[7]) <= 100
+
+def test_http_round_trip_and_errors():
+    async def scenario(server):
+        return [
+            await http_get(server, b'/pick?start=1&end=100'),
+            await http_get(server, b'/pick_many?start=1&end=100&n=3'),
+            await http_get(server, b'/pick?start=1&end=1000000000000000000000'),
+            await http_get(server, b'/pick?start=1'),
+            await http_get(server, b'/pick?start=\xff&end=2'),
+            await http_get(server, b'/unknown?start=1&end=2')
+        ]
+    responses = run_with_server(scenario)
+    assert responses[0][0] == '200 OK' and 1 <= responses[0][1]['number'] <= 100
+    assert responses[1][0] == '200 OK' and len(responses[1][1]['numbers']) == 3
+    assert [status for status, _ in responses[2:]] == ['400 Bad Request'] * 3 + ['404 Not Found']
+
+def test_concurrent_first_requests_build_one_picker(monkeypatch):
+    built = []
+    picker_class = server_module.RandomPicker
+
+    def counting_picker(start, end):
+        built.append((start, end))
+        return picker_class(start, end)
+    monkeypatch.setattr(server_module, 'RandomPicker', counting_picker)
+
+    async def scenario(server):
+        return await asyncio.gather(*(server.pick_many(1, 10**5, 10) for _ in range(8)))
+    results = run_with_server(scenario)
+    assert built == [(1, 10**5)]
+    assert all(len(numbers) == 10 for numbers in results)
+
+def test_batches_are_capped_at_max_batch():
+    picker = RandomPicker(1, 1000)
+    calls = []
+    pick_many = picker.pick_many
+
+    def recording_pick_many(n):
+        calls.append(n)
+        return pick_many(n)
+    picker.pick_many = recording_pick_many
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            batcher = RangeBatcher(picker, executor, batch_window=0.001, max_batch=10)
+            return await asyncio.gather(*(batcher.request(count) for count in (4, 4, 4, 12)))
+    results = asyncio.run(main())
+    # Whole requests only, and a single oversized request still gets served
+    assert calls == [8, 4, 12]
+    assert [len(numbers) for numbers in results] == [4, 4, 4, 12]